@@ -0,0 +1,81 @@
+from profiling import stage
+from rollup import daily_totals
+from utils import calculate_streak
+
+
+class DataContext:
+    """Per-rerun view of the current user's study data.
+
+    Streamlit reruns the whole script on every interaction, and the sidebar
+    and the page used to each read the user's CSV and recompute the streak
+    and XP from it. A DataContext is created once per rerun: the first
+    access to user_data loads the CSV, and derived metrics are computed at
+    most once from that frame or from the pre-aggregated rollup cube.
+    Writes made through the context invalidate it so the rest of the rerun
+    sees the new data. loads counts the CSV reads made during this rerun.
+    """
+
+    def __init__(self, store, gamification, username):
+        self.store = store
+        self.gamification = gamification
+        self.username = username
+        self.loads = 0
+        self._user_data = None
+        self._derived = {}
+
+    @property
+    def user_data(self):
+        if self._user_data is None:
+            with stage("context.load_user_data") as record:
+                self._user_data = self.store.get_user_data(self.username)
+                record['rows'] = len(self._user_data)
+            self.loads += 1
+        return self._user_data
+
+    def _memo(self, name, compute):
+        if name not in self._derived:
+            self._derived[name] = compute()
+        return self._derived[name]
+
+    @property
+    def streak(self):
+        return self._memo('streak', lambda: calculate_streak(self.user_data))
+
+    @property
+    def total_xp(self):
+        return self._memo('total_xp', lambda: self.gamification.calculate_total_xp(self.user_data))
+
+    @property
+    def level(self):
+        return self._memo('level', lambda: self.gamification.get_level(self.total_xp))
+
+    @property
+    def rollup(self):
+        """The user's day x subject rollup cube (rollup.py)"""
+        # hand over the frame if it is already loaded, in case the cube needs a rebuild
+        return self._memo('rollup', lambda: self.store.get_rollup(self.username, self._user_data))
+
+    @property
+    def daily(self):
+        """Minutes, sessions and average confidence per date"""
+        return self._memo('daily', lambda: daily_totals(self.rollup))
+
+    def invalidate(self):
+        """Forget the loaded frame and derived metrics after a write"""
+        self._user_data = None
+        self._derived.clear()
+
+    def log_study_session(self, subject, chapter, duration, confidence, date, notes=""):
+        success = self.store.log_study_session(self.username, subject, chapter, duration, confidence, date, notes)
+        if success:
+            self.invalidate()
+        return success
+
+    def delete_user_data(self):
+        success = self.store.delete_user_data(self.username)
+        if success:
+            self.invalidate()
+        return success
+
+    def metrics(self):
+        return {'username': self.username, 'loads': self.loads, 'derived': sorted(self._derived)}
@@ -0,0 +1,17 @@
+"""Helpers shared by the benchmark scripts.
+
+Import as ``from benchmarks._common import ...`` after putting the
+repository root on sys.path, as every script here does.
+"""
+import numpy as np
+
+
+def random_candidate_rows(n, seed=0):
+    """n placement candidates as a float matrix in FEATURE_COLUMNS order"""
+    rng = np.random.default_rng(seed)
+    return np.column_stack([
+        rng.uniform(5, 10, n), rng.integers(0, 3, n), rng.integers(0, 4, n),
+        rng.integers(0, 4, n), rng.integers(50, 100, n), rng.uniform(3, 5, n),
+        rng.integers(0, 2, n), rng.integers(0, 2, n), rng.integers(50, 95, n),
+        rng.integers(50, 95, n),
+    ]).astype(float)
@@ -0,0 +1,78 @@
+"""Plotly payload of the history charts: every point vs downsampled.
+
+Builds the Dashboard line chart and the Progress Reports bar and scatter
+charts for synthetic histories of growing length, once from the full data
+(as the pages used to) and once through downsampling.py, and prints the
+points and serialized figure size of each.
+
+Usage:
+    python benchmarks/chart_payload.py [--years 1 3 10] [--sessions-per-day 4] [--subjects 8]
+"""
+import argparse
+import os
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+from downsampling import bin_scatter, downsample_line, resample_rollup
+from rollup import build_rollup, daily_totals
+
+
+def _sessions(days, per_day, subjects, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = days * per_day
+    start = date.today() - timedelta(days=days - 1)
+    return pd.DataFrame({
+        'date': [start + timedelta(days=int(d)) for d in np.sort(rng.integers(0, days, rows))],
+        'subject': rng.integers(0, subjects, rows).astype(str),
+        'duration_minutes': rng.integers(10, 120, rows),
+        'confidence_rating': rng.integers(1, 6, rows),
+    })
+
+
+def _figures(sessions, downsampled):
+    cube = build_rollup(sessions)
+    daily = daily_totals(cube)
+    if downsampled:
+        line = downsample_line(daily, 'date', 'duration_minutes')
+        bars, _ = resample_rollup(cube)
+        scatter, resolution = bin_scatter(sessions)
+        size = None if resolution is None else 'sessions'
+        scatter_fig = px.scatter(scatter, x='date', y='confidence_rating', size=size, color='subject')
+    else:
+        line, bars, scatter = daily, daily, sessions
+        scatter_fig = px.scatter(scatter, x='date', y='confidence_rating', color='subject')
+    return {
+        'line': (len(line), px.line(line, x='date', y='duration_minutes')),
+        'bar': (len(bars), px.bar(bars, x='date', y='duration_minutes')),
+        'scatter': (len(scatter), scatter_fig),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=float, nargs="+", default=[1, 3, 10])
+    parser.add_argument("--sessions-per-day", type=int, default=4)
+    parser.add_argument("--subjects", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'years':>6} {'sessions':>9} {'chart':>8} {'points':>15} {'payload KB':>19}")
+    for years in args.years:
+        sessions = _sessions(int(years * 365), args.sessions_per_day, args.subjects)
+        full = _figures(sessions, downsampled=False)
+        small = _figures(sessions, downsampled=True)
+        for chart in full:
+            (full_points, full_fig), (small_points, small_fig) = full[chart], small[chart]
+            full_kb = len(full_fig.to_json()) / 1024
+            small_kb = len(small_fig.to_json()) / 1024
+            print(f"{years:>6g} {len(sessions):>9} {chart:>8} {full_points:>7} -> {small_points:>5} "
+                  f"{full_kb:>8.0f} -> {small_kb:>7.0f}")
+
+
+if __name__ == "__main__":
+    main()
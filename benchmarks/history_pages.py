@@ -0,0 +1,84 @@
+"""Session History browsing: full CSV load per view vs the row index.
+
+``full`` is what a history page without an index has to do on every
+rerun: read the whole study CSV, filter it and sort it newest first to
+show one page. ``index`` builds session_index.SessionIndex once (timed
+separately) and then answers each view with a query on its arrays plus a
+seek-and-parse of the single page.
+
+Usage:
+    python benchmarks/history_pages.py [--rows 10000 100000 500000] [--page-size 50] [--repeat 3]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from session_index import SessionIndex
+
+
+def _write_sessions(path, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    start = date(2020, 1, 1)
+    days = np.sort(rng.integers(0, 5 * 365, rows))
+    pd.DataFrame({
+        'date': [start + timedelta(days=int(d)) for d in days],
+        'subject': rng.integers(0, 12, rows).astype(str),
+        'chapter': rng.integers(0, 30, rows).astype(str),
+        'duration_minutes': rng.integers(10, 120, rows),
+        'confidence_rating': rng.integers(1, 6, rows),
+        'notes': np.where(rng.random(rows) < 0.2, "revisited, see \"summary\"", ""),
+        'timestamp': "2024-01-01T00:00:00",
+    }).to_csv(path, index=False)
+
+
+def full_view(path, subjects, page_size):
+    data = pd.read_csv(path, dtype={'subject': str, 'chapter': str})
+    data['date'] = pd.to_datetime(data['date']).dt.date
+    matching = data[data['subject'].isin(subjects) & (data['confidence_rating'] >= 3)]
+    return matching.iloc[::-1].sort_values('date', ascending=False, kind='stable').head(page_size)
+
+
+def index_view(index, subjects, page_size):
+    return index.page(index.query(subjects=subjects, min_confidence=3), 1, page_size)
+
+
+def _time(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 500_000])
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    subjects = ["1", "4"]
+    print(f"{'rows':>8} {'full view ms':>13} {'index build ms':>15} {'index view ms':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.rows:
+            path = os.path.join(tmp, f"sessions_{rows}.csv")
+            _write_sessions(path, rows)
+            full = _time(lambda: full_view(path, subjects, args.page_size), args.repeat)
+            build = _time(lambda: SessionIndex(path), 1)
+            index = SessionIndex(path)
+            view = _time(lambda: index_view(index, subjects, args.page_size), args.repeat)
+            print(f"{rows:>8} {full:>13.1f} {build:>15.1f} {view:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Cold-start import benchmark based on ``python -X importtime``.
+
+Each scenario is imported in a fresh interpreter so nothing is shared between
+runs. The script reports the median total import time per scenario and which
+heavy third-party packages ended up in ``sys.modules``.
+
+``eager`` reproduces what ``elevate.py`` used to import at module level
+(plotly, scikit-learn via MLAnalyzer and reportlab via PDFExporter), ``lazy`` is what
+the app imports today before any page is rendered.
+
+Usage:
+    python benchmarks/import_time.py [--runs 5] [--target 0.50]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_PACKAGES = ["streamlit", "sklearn", "reportlab", "plotly", "scipy"]
+
+SCENARIOS = {
+    "eager": ("import elevate, ml_analyzer, pdf_exporter, plotly.express, plotly.graph_objects, "
+              "sklearn.ensemble, sklearn.cluster, sklearn.preprocessing, sklearn.model_selection"),
+    "lazy": "import elevate",
+    "data_layer": "import data_store, utils, gamification",
+}
+
+# Minimum relative cold-start reduction of "lazy" over "eager"
+DEFAULT_TARGET = 0.50
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def _run_scenario(statement):
+    """Run one import statement in a fresh interpreter and parse its timings"""
+    probe = (
+        f"{statement}\n"
+        "import sys\n"
+        f"print(','.join(p for p in {HEAVY_PACKAGES!r} if p in sys.modules))\n"
+    )
+    env = dict(os.environ)
+    env["PYTHONPATH"] = REPO_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", probe],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Import failed for {statement!r}:\n{result.stderr[-2000:]}")
+
+    total_us = 0
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        # Only top-level entries (no indentation) so nested imports are not double counted
+        if match and len(match.group(3)) == 1:
+            total_us += int(match.group(2))
+
+    loaded = [p for p in result.stdout.strip().splitlines()[-1].split(',') if p] if result.stdout.strip() else []
+    return total_us / 1000.0, loaded
+
+
+def measure(runs=5):
+    """Return {scenario: {'median_ms', 'runs_ms', 'heavy_loaded'}}"""
+    results = {}
+    for name, statement in SCENARIOS.items():
+        timings = []
+        loaded = []
+        for _ in range(runs):
+            elapsed_ms, loaded = _run_scenario(statement)
+            timings.append(elapsed_ms)
+        results[name] = {
+            'median_ms': statistics.median(timings),
+            'runs_ms': timings,
+            'heavy_loaded': loaded,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="interpreter launches per scenario")
+    parser.add_argument("--target", type=float, default=DEFAULT_TARGET,
+                        help="required relative reduction of lazy vs eager cold start")
+    args = parser.parse_args()
+
+    results = measure(args.runs)
+
+    print(f"{'scenario':<12} {'median ms':>10}  heavy packages loaded")
+    for name, info in results.items():
+        heavy = ", ".join(info['heavy_loaded']) or "-"
+        print(f"{name:<12} {info['median_ms']:>10.1f}  {heavy}")
+
+    eager = results['eager']['median_ms']
+    lazy = results['lazy']['median_ms']
+    reduction = 1 - lazy / eager if eager else 0.0
+    print(f"\ncold-start reduction: {reduction:.1%} (target {args.target:.0%})")
+
+    if reduction < args.target:
+        print("FAIL: cold-start reduction below target")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Per-process memory of the placement model across several app processes.
+
+Starts --processes interpreters at once per engine, each loading the model
+through PlacementModelRegistry and scoring one row, and reports memory
+before and after loading from /proc/self/smaps_rollup (Linux):
+
+  * rss: resident pages, counting shared pages in full for every process
+  * pss: proportional share, shared pages divided among the processes
+  * shared: resident pages also mapped by another process
+
+Engines:
+  * sklearn: unpickled estimator, private copy per process
+  * numpy: exported arrays read into private memory (mmap=False)
+  * numpy-mmap: exported arrays memory-mapped read-only (the default)
+
+The logistic regression arrays are only a few hundred bytes, so most of
+the difference comes from what each engine imports, not the weights; the
+mmap path is what keeps a larger exported model from multiplying per process.
+
+Usage:
+    python benchmarks/model_memory.py [--processes 4]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENGINES = {
+    "sklearn": "engine='sklearn'",
+    "numpy": "engine='numpy', mmap=False",
+    "numpy-mmap": "engine='numpy', mmap=True",
+}
+
+_PROBE = """
+import json, sys, warnings
+import numpy as np
+
+def memory():
+    fields = {{}}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1])
+    return {{
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'shared': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+    }}
+
+warnings.filterwarnings('ignore')
+before = memory()
+from placement_model import PlacementModelRegistry
+registry = PlacementModelRegistry({options})
+registry.predict(np.zeros((1, 10)))
+print('ready', flush=True)
+sys.stdin.readline()  # hold the mapping until every process has loaded
+print(json.dumps({{'before': before, 'after': memory()}}), flush=True)
+"""
+
+
+def _run_engine(options, processes):
+    """Load the model in several concurrent processes and return their memory reports"""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = REPO_ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    probe = _PROBE.format(options=options)
+    procs = [
+        subprocess.Popen([sys.executable, "-c", probe], cwd=REPO_ROOT, env=env, text=True,
+                         stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        for _ in range(processes)
+    ]
+    for proc in procs:
+        if proc.stdout.readline().strip() != "ready":
+            raise RuntimeError(f"Model load failed:\n{proc.stderr.read()[-2000:]}")
+
+    reports = []
+    for proc in procs:
+        proc.stdin.write("\n")
+        proc.stdin.flush()
+        reports.append(json.loads(proc.stdout.readline()))
+        proc.wait()
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=4)
+    args = parser.parse_args()
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("This benchmark needs /proc/self/smaps_rollup (Linux).")
+        return 1
+
+    print(f"{args.processes} processes per engine, mean per process (MiB)\n")
+    print(f"{'engine':<12} {'rss before':>11} {'rss after':>10} {'pss after':>10} {'shared':>8} {'model cost':>11}")
+    for name, options in ENGINES.items():
+        reports = _run_engine(options, args.processes)
+
+        def mean(phase, field):
+            return statistics.mean(r[phase][field] for r in reports) / 1024
+
+        print(f"{name:<12} {mean('before', 'rss'):>11.1f} {mean('after', 'rss'):>10.1f} "
+              f"{mean('after', 'pss'):>10.1f} {mean('after', 'shared'):>8.1f} "
+              f"{mean('after', 'pss') - mean('before', 'pss'):>11.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""Aggregation cost of a PDF report: per-section pandas work vs the shared bundle.
+
+``legacy`` repeats the computations the report sections used to run on
+their own (a subject groupby, a chapter groupby, value_counts, nunique
+calls and one filter + sort per subject for the trends);
+``bundle`` is pdf_exporter.compute_report_aggregates, which every section
+now reads from. Only the aggregation is timed, not the reportlab build.
+
+Usage:
+    python benchmarks/pdf_aggregates.py [--rows 1000 10000 100000] [--subjects 20] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from pdf_exporter import compute_report_aggregates
+
+
+def _sessions(rows, subjects, seed=0):
+    rng = np.random.default_rng(seed)
+    start = date(2024, 1, 1)
+    return pd.DataFrame({
+        'date': [start + timedelta(days=int(d)) for d in np.sort(rng.integers(0, 365, rows))],
+        'subject': rng.integers(0, subjects, rows).astype(str),
+        'chapter': rng.integers(0, 15, rows).astype(str),
+        'duration_minutes': rng.integers(10, 120, rows),
+        'confidence_rating': rng.integers(1, 6, rows),
+    })
+
+
+def legacy_aggregates(user_data):
+    """The aggregation work the sections used to do independently"""
+    user_data['duration_minutes'].sum()
+    user_data['confidence_rating'].mean()
+    user_data['subject'].nunique()
+    user_data['chapter'].nunique()
+
+    unique_days = user_data['date'].nunique()
+    user_data['duration_minutes'].sum() / unique_days
+    user_data['duration_minutes'].mean()
+    user_data['duration_minutes'].max()
+    user_data['duration_minutes'].min()
+    user_data['confidence_rating'].value_counts().sort_index()
+
+    user_data.groupby('subject').agg({
+        'duration_minutes': ['sum', 'count', 'mean'],
+        'confidence_rating': ['mean', 'std']
+    }).round(2)
+
+    for subject in user_data['subject'].unique():
+        subject_data = user_data[user_data['subject'] == subject].sort_values('date')
+        if len(subject_data) >= 3:
+            subject_data.iloc[:len(subject_data)//3]['confidence_rating'].mean()
+            subject_data.iloc[-len(subject_data)//3:]['confidence_rating'].mean()
+
+    user_data.groupby(['subject', 'chapter'])['confidence_rating'].mean()
+
+
+def _time(fn, data, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(data)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--subjects", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>8} {'legacy ms':>10} {'bundle ms':>10} {'reduction':>10}")
+    for rows in args.rows:
+        data = _sessions(rows, args.subjects)
+        legacy = _time(legacy_aggregates, data, args.repeat)
+        bundle = _time(compute_report_aggregates, data, args.repeat)
+        print(f"{rows:>8} {legacy:>10.1f} {bundle:>10.1f} {1 - bundle / legacy:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Throughput/latency of 1-row placement predictions vs micro-batching.
+
+Three measurements:
+  * sequential: one thread scoring single rows back to back
+  * direct: N client threads each calling registry.predict on one row
+  * service: N client threads going through MicroBatchPredictor
+
+Usage:
+    python benchmarks/prediction_batching.py [--clients 32] [--requests 2000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from benchmarks._common import random_candidate_rows
+from placement_model import PlacementModelRegistry
+from prediction_service import MicroBatchPredictor
+
+
+def _run_clients(rows, clients, call):
+    """Split rows across client threads, return (elapsed_s, per-request latencies in ms)"""
+    latencies = []
+    lock = threading.Lock()
+    chunks = np.array_split(np.arange(len(rows)), clients)
+
+    def client(indices):
+        local = []
+        for i in indices:
+            start = time.perf_counter()
+            call(rows[i])
+            local.append((time.perf_counter() - start) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(chunk,)) for chunk in chunks]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, latencies
+
+
+def _report(name, n, elapsed, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    print(f"{name:<12} {n / elapsed:>10.0f} req/s   p50 {statistics.median(latencies):>7.2f} ms   p95 {p95:>7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--max-wait-ms", type=float, default=None,
+                        help="coalescing window (default: chosen from the engine)")
+    parser.add_argument("--engine", choices=["auto", "numpy", "sklearn"], default="auto")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    registry = PlacementModelRegistry(engine=args.engine)
+    registry.get()  # exclude model loading from the measurements
+    rows = random_candidate_rows(args.requests)
+
+    elapsed, latencies = _run_clients(rows, 1, lambda row: registry.predict(row.reshape(1, -1)))
+    _report("sequential", len(rows), elapsed, latencies)
+
+    elapsed, latencies = _run_clients(rows, args.clients, lambda row: registry.predict(row.reshape(1, -1)))
+    _report("direct", len(rows), elapsed, latencies)
+
+    service = MicroBatchPredictor(registry, max_wait_ms=args.max_wait_ms)
+    elapsed, latencies = _run_clients(rows, args.clients, service.predict)
+    _report("service", len(rows), elapsed, latencies)
+    service.close()
+
+    start = time.perf_counter()
+    registry.predict(rows)
+    single_call = time.perf_counter() - start
+    print(f"{'one call':<12} {len(rows) / single_call:>10.0f} req/s   ({len(rows)} rows in a single predict)")
+
+    metrics = service.metrics()
+    print(f"\nengine: {registry.active_engine}")
+    print(f"service batches: {metrics['batches']}, mean batch size {metrics['mean_batch_size']:.1f}, "
+          f"max {metrics['max_batch_size']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Load test of the "Predict Placement" click handler, old vs current.
+
+Each simulated click runs on a pool of worker threads, standing in for
+the Streamlit script threads that serve concurrent sessions:
+  * sleep: the previous handler, predict then 100 x 0.05 s progress sleeps
+  * current: model load check, prediction cache and micro-batching service
+
+Usage:
+    python benchmarks/prediction_load_test.py [--workers 8] [--clicks 64] [--delay-scale 1.0]
+
+--delay-scale shrinks the old 5 s animation to keep the run short; the
+reported sleep throughput then scales up by the same factor.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks._common import random_candidate_rows
+from placement_model import PlacementModelRegistry
+from prediction_cache import PredictionCache
+from prediction_service import MicroBatchPredictor
+
+
+def _run(handler, rows, workers):
+    """Run one handler call per row on a worker pool, return (elapsed_s, latencies in ms)"""
+    def timed(row):
+        start = time.perf_counter()
+        handler(row)
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        latencies = list(pool.map(timed, rows))
+    return time.perf_counter() - start, latencies
+
+
+def _report(name, n, elapsed, latencies):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{name:<8} {n / elapsed:>10.1f} clicks/s   p50 {statistics.median(latencies):>9.2f} ms   p95 {p95:>9.2f} ms")
+    return n / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--clicks", type=int, default=64)
+    parser.add_argument("--delay-scale", type=float, default=1.0,
+                        help="fraction of the old 100 x 0.05 s delay to simulate")
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    registry = PlacementModelRegistry()
+    registry.get()
+    service = MicroBatchPredictor(registry)
+    cache = PredictionCache(registry)
+    rows = random_candidate_rows(args.clicks, seed=1)
+
+    def sleep_handler(row):
+        service.predict(row)
+        for _ in range(100):
+            time.sleep(0.05 * args.delay_scale)
+
+    def current_handler(row):
+        registry.get()
+        cache.predict(row, service.predict)
+
+    elapsed, latencies = _run(sleep_handler, rows, args.workers)
+    old = _report("sleep", len(rows), elapsed, latencies)
+    elapsed, latencies = _run(current_handler, rows, args.workers)
+    new = _report("current", len(rows), elapsed, latencies)
+    service.close()
+
+    print(f"\nengine: {registry.active_engine}, workers: {args.workers}")
+    if args.delay_scale != 1.0:
+        print(f"sleep at full 5 s delay: ~{old * args.delay_scale:.1f} clicks/s")
+        old *= args.delay_scale
+    print(f"throughput gain: {new / old:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
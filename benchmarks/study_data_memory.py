@@ -0,0 +1,100 @@
+"""Memory per user of loaded study data: legacy object columns vs the compact schema.
+
+``legacy`` loads a study CSV the way get_user_data used to (inferred
+dtypes, date as Python date objects); ``compact`` is the current
+get_user_data with data_store.STUDY_DTYPES applied. For each user the
+deep memory of both frames and the time of a subject/chapter groupby on
+each are printed; --columns adds the per-column breakdown of the compact
+frame (data_store.memory_report).
+
+Usage:
+    python benchmarks/study_data_memory.py [--data-dir data] [--users alice bob] [--columns]
+    python benchmarks/study_data_memory.py --synthetic 100000
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from data_store import StudyDataStore, memory_report
+
+
+def legacy_load(path):
+    df = pd.read_csv(path)
+    if not df.empty and 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date']).dt.date
+    return df
+
+
+def _groupby_ms(df, repeat=5):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        df.groupby(['subject', 'chapter'], observed=True).agg(
+            {'confidence_rating': ['mean', 'count'], 'duration_minutes': 'sum'})
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def _write_synthetic(store, username, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    start = date(2021, 1, 1)
+    days = np.sort(rng.integers(0, 4 * 365, rows))
+    pd.DataFrame({
+        'date': [start + timedelta(days=int(d)) for d in days],
+        'subject': np.char.add("Subject ", rng.integers(0, 12, rows).astype(str)),
+        'chapter': np.char.add("Chapter ", rng.integers(0, 40, rows).astype(str)),
+        'duration_minutes': rng.integers(10, 180, rows),
+        'confidence_rating': rng.integers(1, 6, rows),
+        'notes': np.where(rng.random(rows) < 0.3, "reviewed summary", ""),
+        'timestamp': [f"{start + timedelta(days=int(d))}T18:30:00" for d in days],
+    }).to_csv(store.get_user_file_path(username), index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--users", nargs="*", help="only these usernames (default: all)")
+    parser.add_argument("--columns", action="store_true", help="print the per-column breakdown")
+    parser.add_argument("--synthetic", type=int, metavar="ROWS",
+                        help="report on one generated user with ROWS sessions instead of --data-dir")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.synthetic:
+            store = StudyDataStore(tmp)
+            _write_synthetic(store, "synthetic", args.synthetic)
+            usernames = ["synthetic"]
+        else:
+            store = StudyDataStore(args.data_dir)
+            usernames = args.users or store.get_all_users()
+
+        print(f"{'user':>16} {'rows':>8} {'legacy MB':>10} {'compact MB':>11} {'saved':>6} "
+              f"{'legacy groupby ms':>18} {'compact groupby ms':>19}")
+        for username in usernames:
+            path = store.get_user_file_path(username)
+            if not os.path.exists(path):
+                continue
+            legacy = legacy_load(path)
+            compact = store.get_user_data(username)
+            report = memory_report(compact)
+            legacy_bytes = legacy.memory_usage(deep=True, index=False).sum()
+            saved = 1 - report['total_bytes'] / legacy_bytes if legacy_bytes else 0.0
+            print(f"{username:>16} {report['rows']:>8} {legacy_bytes / 2**20:>10.2f} "
+                  f"{report['total_bytes'] / 2**20:>11.2f} {saved:>6.0%} "
+                  f"{_groupby_ms(legacy):>18.1f} {_groupby_ms(compact):>19.1f}")
+            if args.columns:
+                for column, info in report['columns'].items():
+                    print(f"{'':>16} {column:>20} {info['dtype']:>12} {info['bytes'] / 1024:>10.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
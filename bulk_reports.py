@@ -0,0 +1,155 @@
+"""Generate PDF progress reports for every user in a process pool.
+
+Each worker process builds its own StudyDataStore and PDFExporter once,
+then loads and renders one user at a time, so only usernames and small
+result dicts cross process boundaries. Reports are written to the output
+directory together with a manifest.json describing every user's outcome
+and the overall pages/sec.
+
+Usage:
+    python bulk_reports.py --output reports/weekly [--period "Last 7 days"]
+                           [--data-dir data] [--workers N] [--users alice bob]
+                           [--include-empty] [--full-history]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from data_store import StudyDataStore
+from utils import REPORT_PERIODS, filter_by_period
+
+MANIFEST_NAME = "manifest.json"
+
+_PAGE_OBJECT = re.compile(rb"/Type\s*/Page(?![A-Za-z])")
+
+# Per-process state set up by _init_worker
+_store = None
+_exporter = None
+
+
+def count_pages(pdf_bytes):
+    """Count page objects in an uncompressed reportlab PDF"""
+    return len(_PAGE_OBJECT.findall(pdf_bytes))
+
+
+def _safe_filename(username):
+    """Filesystem-safe form of username, unique per raw username.
+
+    Sanitizing alone maps e.g. "a b" and "a_b" to the same name, so a short
+    hash of the raw username is appended.
+    """
+    digest = hashlib.sha1(username.encode("utf-8")).hexdigest()[:8]
+    return f"{re.sub(r'[^A-Za-z0-9._-]', '_', username)}_{digest}"
+
+
+def _init_worker(data_dir):
+    global _store, _exporter
+    from pdf_exporter import PDFExporter
+
+    _store = StudyDataStore(data_dir)
+    _exporter = PDFExporter()
+
+
+def _generate_user_report(username, period, output_dir, include_empty, full_history):
+    """Render one user's report in a worker process and return its manifest entry"""
+    start = time.perf_counter()
+    entry = {'username': username, 'file': None, 'sessions': 0, 'pages': 0, 'bytes': 0}
+    try:
+        user_data = filter_by_period(_store.get_user_data(username), period)
+        entry['sessions'] = len(user_data)
+        if user_data.empty and not include_empty:
+            entry['status'] = "skipped"
+            entry['error'] = "no sessions in period"
+            return entry
+
+        pdf_bytes = _exporter.generate_report(username, user_data, period, include_full_history=full_history)
+        file_name = f"study_report_{_safe_filename(username)}_{period.replace(' ', '_')}.pdf"
+        with open(os.path.join(output_dir, file_name), 'wb') as f:
+            f.write(pdf_bytes)
+
+        entry.update(file=file_name, pages=count_pages(pdf_bytes), bytes=len(pdf_bytes), status="ok", error=None)
+    except Exception as e:
+        entry['status'] = "failed"
+        entry['error'] = str(e)
+    finally:
+        entry['seconds'] = round(time.perf_counter() - start, 4)
+    return entry
+
+
+def generate_all_reports(output_dir, period="Last 7 days", data_dir="data", workers=None,
+                         usernames=None, include_empty=False, full_history=False):
+    """Render reports for the given (default: all) users and write the manifest.
+
+    Returns the manifest dict.
+    """
+    if period not in REPORT_PERIODS:
+        raise ValueError(f"Unknown period {period!r}; choose from {', '.join(REPORT_PERIODS)}")
+
+    usernames = list(usernames) if usernames else StudyDataStore(data_dir).get_all_users()
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(data_dir,)) as pool:
+        entries = list(pool.map(
+            _generate_user_report,
+            usernames,
+            [period] * len(usernames),
+            [output_dir] * len(usernames),
+            [include_empty] * len(usernames),
+            [full_history] * len(usernames),
+            chunksize=max(1, len(usernames) // (workers * 4)),
+        ))
+    elapsed = time.perf_counter() - start
+
+    pages = sum(entry['pages'] for entry in entries)
+    manifest = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'period': period,
+        'full_history': full_history,
+        'data_dir': os.path.abspath(data_dir),
+        'workers': workers,
+        'users': len(entries),
+        'reports': sum(entry['status'] == "ok" for entry in entries),
+        'skipped': sum(entry['status'] == "skipped" for entry in entries),
+        'failed': sum(entry['status'] == "failed" for entry in entries),
+        'pages': pages,
+        'seconds': round(elapsed, 3),
+        'pages_per_second': round(pages / elapsed, 2) if elapsed > 0 else 0.0,
+        'entries': entries,
+    }
+    with open(os.path.join(output_dir, MANIFEST_NAME), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", required=True, help="directory for the PDFs and manifest.json")
+    parser.add_argument("--period", default="Last 7 days", choices=list(REPORT_PERIODS))
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--users", nargs="*", help="only these usernames")
+    parser.add_argument("--include-empty", action="store_true",
+                        help="also render reports for users with no sessions in the period")
+    parser.add_argument("--full-history", action="store_true",
+                        help="append every session in the period to each report")
+    args = parser.parse_args(argv)
+
+    manifest = generate_all_reports(args.output, args.period, args.data_dir, args.workers,
+                                    args.users, args.include_empty, args.full_history)
+    print(f"{manifest['reports']} reports, {manifest['skipped']} skipped, {manifest['failed']} failed "
+          f"in {manifest['seconds']:.2f}s with {manifest['workers']} workers "
+          f"({manifest['pages']} pages, {manifest['pages_per_second']:.1f} pages/sec)")
+    print(f"Manifest: {os.path.join(args.output, MANIFEST_NAME)}")
+    return 1 if manifest['failed'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+import numpy as np
+import pandas as pd
+import os
+from datetime import datetime
+import hashlib
+import json
+
+from rollup import add_session, build_rollup, read_rollup, write_rollup
+
+STUDY_COLUMNS = ['date', 'subject', 'chapter', 'duration_minutes', 'confidence_rating', 'notes', 'timestamp']
+
+# Compact in-memory schema of loaded study data; date and timestamp become datetime64.
+# Durations are capped at 1440 minutes and ratings are 1-5, so int16/int8 hold them.
+STUDY_DTYPES = {
+    'subject': 'category',
+    'chapter': 'category',
+    'duration_minutes': 'int16',
+    'confidence_rating': 'int8',
+}
+
+
+def apply_study_schema(df):
+    """Cast loaded sessions to the compact schema in place and return df.
+
+    Integer columns are only narrowed when that is lossless (no missing,
+    fractional or out-of-range values); otherwise they keep their dtype.
+    """
+    for column, dtype in STUDY_DTYPES.items():
+        if column not in df.columns or df[column].dtype == dtype:
+            continue
+        values = df[column]
+        if dtype != 'category':
+            info = np.iinfo(dtype)
+            if (values.isna().any() or (values % 1 != 0).any()
+                    or values.min() < info.min or values.max() > info.max):
+                continue
+        df[column] = values.astype(dtype)
+
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date']).dt.normalize()
+    if 'timestamp' in df.columns:
+        df['timestamp'] = pd.to_datetime(df['timestamp'], format='ISO8601', errors='coerce')
+    return df
+
+
+def memory_report(df):
+    """Per-column dtype and deep memory use of a sessions frame"""
+    usage = df.memory_usage(deep=True, index=False)
+    return {
+        'rows': len(df),
+        'total_bytes': int(usage.sum()),
+        'columns': {column: {'dtype': str(df[column].dtype), 'bytes': int(usage[column])} for column in df.columns},
+    }
+
+
+class DataStoreError(Exception):
+    """Base class for data layer failures"""
+
+    def __init__(self, message, username=None, path=None):
+        super().__init__(message)
+        self.username = username
+        self.path = path
+
+
+class UserDataLoadError(DataStoreError):
+    """Raised when a user's study data cannot be read"""
+
+
+class SessionWriteError(DataStoreError):
+    """Raised when a study session cannot be persisted"""
+
+
+class UserDeleteError(DataStoreError):
+    """Raised when a user's data cannot be removed"""
+
+
+class BackupError(DataStoreError):
+    """Raised when a backup cannot be created"""
+
+
+class StudyDataStore:
+    """Framework-free access to user auth and study data.
+
+    Failures are raised as DataStoreError subclasses instead of being shown
+    in a UI, so this class can be used from CLIs, batch jobs and worker
+    processes (instances only hold the data directory and are picklable).
+    The Streamlit app uses the DataManager adapter in data_manager.py.
+    """
+
+    def __init__(self, data_dir="data"):
+        self.data_dir = data_dir
+        self.ensure_data_directory()
+
+    def ensure_data_directory(self):
+        """Ensure data directory exists"""
+        if not os.path.exists(self.data_dir):
+            os.makedirs(self.data_dir)
+
+    def get_user_file_path(self, username, file_type="study"):
+        """Get file path for user data"""
+        if file_type == "study":
+            return os.path.join(self.data_dir, f"{username}_study_data.csv")
+        elif file_type == "quiz":
+            return os.path.join(self.data_dir, f"{username}_quiz_data.csv")
+        elif file_type == "auth":
+            return os.path.join(self.data_dir, "user_auth.json")
+        else:
+            return os.path.join(self.data_dir, f"{username}_{file_type}_data.csv")
+
+    def _hash_password(self, password):
+        """Hash password using SHA-256"""
+        return hashlib.sha256(password.encode()).hexdigest()
+
+    def _load_auth_data(self):
+        """Load authentication data from file"""
+        auth_file = self.get_user_file_path("", "auth")
+        if os.path.exists(auth_file):
+            try:
+                with open(auth_file, 'r') as f:
+                    return json.load(f)
+            except:
+                return {}
+        return {}
+
+    def _save_auth_data(self, auth_data):
+        """Save authentication data to file"""
+        auth_file = self.get_user_file_path("", "auth")
+        try:
+            with open(auth_file, 'w') as f:
+                json.dump(auth_data, f)
+            return True
+        except:
+            return False
+
+    def create_user(self, username, password):
+        """Create a new user profile with password"""
+        # Check if user already exists
+        auth_data = self._load_auth_data()
+        if username in auth_data:
+            return False, "Username already exists!"
+
+        file_path = self.get_user_file_path(username)
+        if os.path.exists(file_path):
+            return False, "User data already exists!"
+
+        # Create empty DataFrame with proper columns
+        empty_df = pd.DataFrame(columns=STUDY_COLUMNS)
+        empty_df.to_csv(file_path, index=False)
+
+        # Save user authentication data
+        auth_data[username] = {
+            'password_hash': self._hash_password(password),
+            'created_date': datetime.now().isoformat()
+        }
+
+        if self._save_auth_data(auth_data):
+            return True, "User created successfully!"
+        else:
+            return False, "Failed to save authentication data!"
+
+    def authenticate_user(self, username, password):
+        """Authenticate user with username and password"""
+        auth_data = self._load_auth_data()
+
+        if username not in auth_data:
+            return False, "Username not found!"
+
+        stored_hash = auth_data[username]['password_hash']
+        input_hash = self._hash_password(password)
+
+        if stored_hash == input_hash:
+            return True, "Authentication successful!"
+        else:
+            return False, "Incorrect password!"
+
+    def get_all_users(self):
+        """Get list of all existing users from auth file"""
+        auth_data = self._load_auth_data()
+        return sorted(list(auth_data.keys()))
+
+    def get_user_data(self, username):
+        """Load user's study data, raising UserDataLoadError on failure"""
+        file_path = self.get_user_file_path(username)
+
+        if not os.path.exists(file_path):
+            return pd.DataFrame()
+
+        try:
+            # subject/chapter are parsed straight into categoricals
+            df = pd.read_csv(file_path, dtype={'subject': 'category', 'chapter': 'category'})
+            if df.empty:
+                return df
+            apply_study_schema(df)
+            # datetime64 days in ascending order (stable, so same-day sessions
+            # keep their logging order); utils.slice_period relies on both
+            if 'date' in df.columns and not df['date'].is_monotonic_increasing:
+                df = df.sort_values('date', kind='stable', ignore_index=True)
+            return df
+        except Exception as e:
+            raise UserDataLoadError(f"Error loading user data: {str(e)}", username, file_path) from e
+
+    def _rollup_is_fresh(self, username):
+        rollup_file = self.get_user_file_path(username, "rollup")
+        study_file = self.get_user_file_path(username)
+        if not os.path.exists(rollup_file):
+            return False
+        # written after every session, so an older rollup missed a write
+        return not os.path.exists(study_file) or os.path.getmtime(rollup_file) >= os.path.getmtime(study_file)
+
+    def get_rollup(self, username, user_data=None):
+        """Load the user's day x subject rollup cube (see rollup.py).
+
+        The cube is rebuilt from the sessions (user_data if given, else the
+        study CSV) when it is missing or older than the study file.
+        """
+        rollup_file = self.get_user_file_path(username, "rollup")
+        if self._rollup_is_fresh(username):
+            try:
+                return read_rollup(rollup_file)
+            except Exception:
+                pass  # unreadable: rebuild below
+
+        if user_data is None:
+            user_data = self.get_user_data(username)
+        cube = build_rollup(user_data)
+        try:
+            write_rollup(cube, rollup_file)
+        except OSError:
+            pass  # the cube is derived data; rebuilt again on the next read
+        return cube
+
+    def memory_report(self, username):
+        """memory_report() of the user's sessions as loaded (compact schema)"""
+        return memory_report(self.get_user_data(username))
+
+    def get_session_index(self, username):
+        """Return the SessionIndex over the user's study CSV, or None if they have none"""
+        from session_index import get_session_index_cache
+
+        file_path = self.get_user_file_path(username)
+        try:
+            return get_session_index_cache().get(file_path)
+        except Exception as e:
+            raise UserDataLoadError(f"Error indexing user data: {str(e)}", username, file_path) from e
+
+    def log_study_session(self, username, subject, chapter, duration, confidence, date, notes=""):
+        """Log a new study session, raising SessionWriteError on failure"""
+        file_path = self.get_user_file_path(username)
+        try:
+            # Create new session data
+            new_session = {
+                'date': date,
+                'subject': subject,
+                'chapter': chapter,
+                'duration_minutes': duration,
+                'confidence_rating': confidence,
+                'notes': notes,
+                'timestamp': datetime.now().isoformat()
+            }
+
+            # Load existing data or create new DataFrame
+            if os.path.exists(file_path):
+                df = pd.read_csv(file_path)
+            else:
+                df = pd.DataFrame()
+
+            # read before the study file changes, while its freshness check still holds
+            rollup = self.get_rollup(username, user_data=df)
+
+            # Append new session
+            new_df = pd.DataFrame([new_session])
+            df = pd.concat([df, new_df], ignore_index=True)
+
+            # Save back to CSV
+            df.to_csv(file_path, index=False)
+        except Exception as e:
+            raise SessionWriteError(f"Error logging study session: {str(e)}", username, file_path) from e
+
+        try:
+            write_rollup(add_session(rollup, date, subject, duration, confidence),
+                         self.get_user_file_path(username, "rollup"))
+        except OSError:
+            pass  # left older than the study file, so the next read rebuilds it
+        return True
+
+    def delete_user_data(self, username):
+        """Delete all data for a user including authentication"""
+        study_file = self.get_user_file_path(username, "study")
+        try:
+            for path in (study_file, self.get_user_file_path(username, "rollup")):
+                if os.path.exists(path):
+                    os.remove(path)
+
+            # Remove from auth data
+            auth_data = self._load_auth_data()
+            if username in auth_data:
+                del auth_data[username]
+                self._save_auth_data(auth_data)
+
+            return True
+        except Exception as e:
+            raise UserDeleteError(f"Error deleting user data: {str(e)}", username, study_file) from e
+
+    def backup_user_data(self, username):
+        """Create a backup of user data"""
+        backup_dir = os.path.join(self.data_dir, "backups")
+        try:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+            if not os.path.exists(backup_dir):
+                os.makedirs(backup_dir)
+
+            # Backup study data
+            study_file = self.get_user_file_path(username, "study")
+            if os.path.exists(study_file):
+                backup_study_file = os.path.join(backup_dir, f"{username}_study_backup_{timestamp}.csv")
+                pd.read_csv(study_file).to_csv(backup_study_file, index=False)
+
+            return True
+        except Exception as e:
+            raise BackupError(f"Error creating backup: {str(e)}", username, backup_dir) from e
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+from rollup import daily_totals
+
+# Upper bounds on the points a single chart sends to the browser
+MAX_LINE_POINTS = 500
+MAX_BARS = 120
+MAX_SCATTER_POINTS = 2000
+
+RESOLUTIONS = ('D', 'W', 'M')
+RESOLUTION_LABELS = {'D': "Daily", 'W': "Weekly", 'M': "Monthly"}
+
+
+def to_days(dates):
+    """Dates (date objects, strings or datetimes) as a datetime64[D] array"""
+    return pd.to_datetime(pd.Series(dates)).to_numpy().astype('datetime64[D]')
+
+
+def bin_dates(days, resolution):
+    """Map datetime64[D] days to the first day of their day, week (Monday) or month"""
+    if resolution == 'D':
+        return days
+    if resolution == 'W':
+        # 1970-01-01 was a Thursday, so shift by 3 to get Monday-based weeks
+        return days - (days.astype('int64') + 3) % 7
+    return days.astype('datetime64[M]').astype('datetime64[D]')
+
+
+def choose_resolution(days, max_points):
+    """Finest resolution whose number of distinct bins in days fits max_points"""
+    for resolution in RESOLUTIONS:
+        if len(np.unique(bin_dates(days, resolution))) <= max_points:
+            return resolution
+    return 'M'
+
+
+def lttb(x, y, threshold=MAX_LINE_POINTS):
+    """Largest-Triangle-Three-Buckets: indices of at most threshold points.
+
+    Keeps the first and last point and, from each of threshold - 2 equal
+    buckets in between, the point forming the largest triangle with the
+    previously kept point and the average of the next bucket, so peaks and
+    dips survive the reduction.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    keep = np.empty(threshold, dtype=int)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        keep[i + 1] = a
+    return keep
+
+
+def downsample_line(frame, x, y, threshold=MAX_LINE_POINTS):
+    """Rows of frame kept by LTTB over columns x (dates or numbers) and y"""
+    if len(frame) <= threshold:
+        return frame
+    xs = frame[x]
+    if not pd.api.types.is_numeric_dtype(xs):
+        xs = to_days(xs).astype('int64')
+    return frame.iloc[lttb(xs, frame[y], threshold)]
+
+
+def resample_rollup(cube, max_points=MAX_BARS):
+    """Per-period totals of a rollup cube at the finest resolution within max_points.
+
+    Falls back to months when even those exceed max_points. Returns
+    (totals, resolution) where totals has the daily_totals columns with
+    date set to the first day of each period.
+    """
+    days = to_days(cube['date'])
+    resolution = choose_resolution(days, max_points)
+    return daily_totals(cube.assign(date=bin_dates(days, resolution))), resolution
+
+
+def bin_scatter(sessions, max_points=MAX_SCATTER_POINTS):
+    """Bound a per-session scatter of confidence_rating over date by subject.
+
+    Up to max_points sessions are returned as they are (resolution None).
+    Longer histories are binned per (period, subject) into the mean rating
+    and a sessions count, at the finest resolution within max_points
+    markers (monthly beyond that). Returns (points, resolution).
+    """
+    if len(sessions) <= max_points:
+        return sessions[['date', 'subject', 'confidence_rating']], None
+
+    days = to_days(sessions['date'])
+    frame = pd.DataFrame({
+        'subject': sessions['subject'].astype(str).to_numpy(),
+        'confidence_rating': sessions['confidence_rating'].to_numpy(),
+    })
+    for resolution in RESOLUTIONS:
+        points = (frame.assign(date=bin_dates(days, resolution))
+                  .groupby(['date', 'subject'], sort=True)['confidence_rating']
+                  .agg(confidence_rating='mean', sessions='size').reset_index())
+        if len(points) <= max_points:
+            break
+    points['confidence_rating'] = points['confidence_rating'].round(2)
+    return points, resolution
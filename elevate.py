@@ -1,16 +1,18 @@
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
-import os
-import random
 
 from data_manager import DataManager
-from ml_analyzer import MLAnalyzer
 from gamification import GamificationSystem
-from pdf_exporter import PDFExporter
-from utils import format_time, calculate_streak
+from app_context import DataContext
+from downsampling import RESOLUTION_LABELS, bin_scatter, downsample_line, resample_rollup
+from rollup import subject_totals, summarize
+from utils import format_time, filter_by_period, recent_sessions, REPORT_PERIODS
+
+# Heavy, page-specific dependencies (plotly, scikit-learn via MLAnalyzer,
+# reportlab via PDFExporter) are imported inside the page functions that
+# use them, so a rerun of e.g. "Log Study Session" never pays for them.
+# See benchmarks/import_time.py for the cold-start budget.
 
 # Configure page
 st.set_page_config(
@@ -98,6 +100,12 @@ def show_user_selection():
         st.info("💡 **Password Requirements:**\n- At least 6 characters long\n- Choose something you'll remember!")
 
 def show_main_app():
+    # Fresh per rerun: every page below reads the user's data through it
+    st.session_state.data_context = DataContext(
+        st.session_state.data_manager, st.session_state.gamification, st.session_state.current_user
+    )
+    ctx = st.session_state.data_context
+
     # Sidebar navigation
     with st.sidebar:
         st.markdown('<h1 style="font-size:48px;">⏏︎ Elevate</h1>', unsafe_allow_html=True)
@@ -105,24 +113,20 @@ def show_main_app():
         st.markdown(f'*your* *next* *level* *in* **learning!**')
         
         # Display user stats
-        user_data = st.session_state.data_manager.get_user_data(st.session_state.current_user)
-        if not user_data.empty:
-            total_xp = st.session_state.gamification.calculate_total_xp(user_data)
-            current_streak = calculate_streak(user_data)
-            level = st.session_state.gamification.get_level(total_xp)
-            
-            st.metric("🏆 Level", level)
-            st.metric("⭐ Total XP", total_xp)
-            st.metric("🔥 Current Streak", f"{current_streak} days")
+        if not ctx.user_data.empty:
+            st.metric("🏆 Level", ctx.level)
+            st.metric("⭐ Total XP", ctx.total_xp)
+            st.metric("🔥 Current Streak", f"{ctx.streak} days")
         
         st.markdown("---")
         
         # Navigation
-        page = st.selectbox(
-            "Navigate to:",
-            ["Dashboard", "Log Study Session", "Weakness Analysis", 
-             "Practice Quiz", "Progress Reports", "Settings","Placement Prediction"]
-        )
+        pages = ["Dashboard", "Log Study Session", "Session History", "Weakness Analysis", 
+                 "Practice Quiz", "Progress Reports", "Settings","Placement Prediction"]
+        # Hidden page, only listed when the app is opened with ?diagnostics=1
+        if st.query_params.get("diagnostics") == "1":
+            pages.append("Diagnostics")
+        page = st.selectbox("Navigate to:", pages)
 
 
         st.markdown("---")
@@ -136,6 +140,8 @@ def show_main_app():
         show_dashboard()
     elif page == "Log Study Session":
         show_study_logging()
+    elif page == "Session History":
+        show_session_history()
     elif page == "Weakness Analysis":
         show_weakness_analysis()
     elif page == "Practice Quiz":
@@ -146,6 +152,8 @@ def show_main_app():
         show_settings()
     elif page == "Placement Prediction":
         show_placement_prediction()
+    elif page == "Diagnostics":
+        show_diagnostics()
         
 def show_quiz_section():
     st.header("Launching soon 🚀 ")
@@ -154,9 +162,12 @@ def show_quiz_section():
 
 
 def show_dashboard():
+    import plotly.express as px
+
     st.header("Study Dashboard")
     
-    user_data = st.session_state.data_manager.get_user_data(st.session_state.current_user)
+    ctx = st.session_state.data_context
+    user_data = ctx.user_data
     
     if user_data.empty:
         st.info("Start your learning journey by logging your first study session!")
@@ -165,10 +176,11 @@ def show_dashboard():
     # Key metrics
     col1, col2, col3, col4 = st.columns(4)
     
-    total_time = user_data['duration_minutes'].sum()
-    total_sessions = len(user_data)
-    avg_confidence = user_data['confidence_rating'].mean()
-    current_streak = calculate_streak(user_data)
+    summary = summarize(ctx.rollup)
+    total_time = summary['total_time']
+    total_sessions = summary['total_sessions']
+    avg_confidence = summary['avg_confidence']
+    current_streak = ctx.streak
     
     with col1:
         st.metric("Total Study Time", format_time(total_time))
@@ -184,7 +196,8 @@ def show_dashboard():
     
     with col1:
         st.subheader("Study Time Trend")
-        daily_data = user_data.groupby('date')['duration_minutes'].sum().reset_index()
+        # LTTB keeps the shape of long histories in at most MAX_LINE_POINTS points
+        daily_data = downsample_line(ctx.daily, 'date', 'duration_minutes').copy()
         daily_data['date'] = pd.to_datetime(daily_data['date'])
         
         fig = px.line(daily_data, x='date', y='duration_minutes',
@@ -194,16 +207,18 @@ def show_dashboard():
     
     with col2:
         st.subheader("Subject Distribution")
-        subject_time = user_data.groupby('subject')['duration_minutes'].sum()
+        subject_time = subject_totals(ctx.rollup)
         
-        fig = px.pie(values=subject_time.values, names=subject_time.index,
+        fig = px.pie(values=subject_time['duration_minutes'], names=subject_time['subject'],
                     title="Time Spent by Subject")
         st.plotly_chart(fig, use_container_width=True)
     
     # recent sessions
     st.subheader("Recent Study Sessions")
-    recent_sessions = user_data.tail(5)[['date', 'subject', 'chapter', 'duration_minutes', 'confidence_rating']]
-    st.dataframe(recent_sessions, use_container_width=True)
+    recent = recent_sessions(user_data, 5)[['date', 'subject', 'chapter', 'duration_minutes', 'confidence_rating']]
+    recent = recent.assign(date=recent['date'].dt.date)
+    st.dataframe(recent, use_container_width=True)
+    st.caption("Browse and filter every session on the Session History page.")
 
 def show_study_logging():
     st.header("Log Study Session")
@@ -230,10 +245,9 @@ def show_study_logging():
         
         if submitted:
             if subject and chapter:
-                success = st.session_state.data_manager.log_study_session(
-                    st.session_state.current_user,
-                    subject, chapter, duration, confidence, study_date, notes
-                )
+                ctx = st.session_state.data_context
+                # invalidates the context, so the figures below include this session
+                success = ctx.log_study_session(subject, chapter, duration, confidence, study_date, notes)
                 
                 if success:
                     # calculate XP gained
@@ -242,9 +256,8 @@ def show_study_logging():
                     st.success(f"Session logged successfully! You gained {xp_gained} XP!")
                     
                     # check for level up
-                    user_data = st.session_state.data_manager.get_user_data(st.session_state.current_user)
-                    total_xp = st.session_state.gamification.calculate_total_xp(user_data)
-                    new_level = st.session_state.gamification.get_level(total_xp)
+                    total_xp = ctx.total_xp
+                    new_level = ctx.level
                     old_level = st.session_state.gamification.get_level(total_xp - xp_gained)
                     
                     if new_level > old_level:
@@ -252,7 +265,7 @@ def show_study_logging():
                         st.success(f"LEVEL UP! You've reached Level {new_level}!")
                     
                     # Show streak info
-                    streak = calculate_streak(user_data)
+                    streak = ctx.streak
                     if streak > 1:
                         st.info(f"Amazing! You're on a {streak}-day study streak!")
                 else:
@@ -260,11 +273,54 @@ def show_study_logging():
             else:
                 st.error("Please fill in both Subject and Chapter fields.")
 
+def show_session_history():
+    st.header("Session History")
+    
+    # Filters run on the index arrays; only the visible page is read from the CSV
+    index = st.session_state.data_manager.get_session_index(st.session_state.current_user)
+    if index is None or len(index) == 0:
+        st.info("No sessions logged yet. Start logging your study sessions!")
+        return
+    
+    first_day, last_day = index.date_range()
+    col1, col2 = st.columns(2)
+    with col1:
+        date_range = st.date_input("Date range:", value=(first_day, last_day),
+                                   min_value=first_day, max_value=last_day)
+        subjects = st.multiselect("Subjects:", index.subjects)
+    with col2:
+        confidence = st.slider("Confidence rating:", min_value=1, max_value=5, value=(1, 5))
+        chapters = st.multiselect("Chapters:", index.chapters_for(subjects))
+    
+    # while the end date is still being picked the range has one element
+    start = date_range[0] if len(date_range) > 0 else None
+    end = date_range[1] if len(date_range) > 1 else None
+    rows = index.query(start, end, subjects, chapters, *confidence)
+    
+    if len(rows) == 0:
+        st.warning("No sessions match these filters.")
+        return
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        page_size = st.selectbox("Sessions per page:", [25, 50, 100], index=1)
+    page_count = -(-len(rows) // page_size)
+    with col2:
+        page_number = st.number_input(f"Page (of {page_count:,}):", min_value=1, max_value=page_count, value=1)
+    
+    page = index.page(rows, page_number, page_size)
+    first = (page_number - 1) * page_size + 1
+    st.caption(f"Sessions {first:,}–{first + len(page) - 1:,} of {len(rows):,}, newest first")
+    columns = ['date', 'subject', 'chapter', 'duration_minutes', 'confidence_rating', 'notes']
+    st.dataframe(page[[c for c in columns if c in page.columns]], use_container_width=True, hide_index=True)
+
 def show_weakness_analysis():
+    from ml_analyzer import MLAnalyzer
+
     st.header("AI-Powered Weakness Analysis")
     st.markdown("---")
     
-    user_data = st.session_state.data_manager.get_user_data(st.session_state.current_user)
+    user_data = st.session_state.data_context.user_data
     
     if len(user_data) < 5:
         st.warning("Need at least 5 study sessions for accurate analysis. Keep logging your sessions!")
@@ -296,47 +352,39 @@ def show_weakness_analysis():
         st.error(f"Analysis failed: {str(e)}")
 
 def show_progress_reports():
+    import plotly.express as px
+
     st.header("Progress Reports")
     
-    user_data = st.session_state.data_manager.get_user_data(st.session_state.current_user)
+    ctx = st.session_state.data_context
+    user_data = ctx.user_data
     
     if user_data.empty:
         st.info("No data available for reports. Start logging your study sessions!")
         return
     
     # time period selector
-    period = st.selectbox("Select Time Period:", 
-                         ["Last 7 days", "Last 30 days", "Last 90 days", "All time"])
-    
-    # Filter data based on period
-    end_date = datetime.now().date()
-    if period == "Last 7 days":
-        start_date = end_date - timedelta(days=7)
-    elif period == "Last 30 days":
-        start_date = end_date - timedelta(days=30)
-    elif period == "Last 90 days":
-        start_date = end_date - timedelta(days=90)
-    else:
-        start_date = user_data['date'].min()
+    period = st.selectbox("Select Time Period:", list(REPORT_PERIODS))
     
-    filtered_data = user_data[
-        (pd.to_datetime(user_data['date']).dt.date >= start_date) &
-        (pd.to_datetime(user_data['date']).dt.date <= end_date)
-    ]
+    # Metrics and aggregate charts read the period's slice of the rollup cube;
+    # the raw sessions are still needed for the scatter, trend and PDF
+    period_rollup = filter_by_period(ctx.rollup, period)
+    filtered_data = filter_by_period(user_data, period)
     
-    if filtered_data.empty:
+    if period_rollup.empty:
         st.warning("No data available for the selected period.")
         return
+    summary = summarize(period_rollup)
     
     # generate comprehensive report
     col1, col2 = st.columns(2)
     
     with col1:
         st.subheader("Study Statistics")
-        total_time = filtered_data['duration_minutes'].sum()
-        avg_session = filtered_data['duration_minutes'].mean()
-        total_sessions = len(filtered_data)
-        unique_subjects = filtered_data['subject'].nunique()
+        total_time = summary['total_time']
+        avg_session = summary['avg_session']
+        total_sessions = summary['total_sessions']
+        unique_subjects = summary['subjects_studied']
         
         st.metric("Total Study Time", format_time(total_time))
         st.metric("Total Sessions", total_sessions)
@@ -345,7 +393,7 @@ def show_progress_reports():
     
     with col2:
         st.subheader("Performance Metrics")
-        avg_confidence = filtered_data['confidence_rating'].mean()
+        avg_confidence = summary['avg_confidence']
         confidence_trend = "📈" if filtered_data['confidence_rating'].tail(5).mean() > filtered_data['confidence_rating'].head(5).mean() else "📉"
         
         st.metric("Average Confidence", f"{avg_confidence:.1f}/5")
@@ -357,29 +405,32 @@ def show_progress_reports():
     tab1, tab2, tab3 = st.tabs(["Time Analysis", "Confidence Tracking", "Subject Performance"])
     
     with tab1:
-        # Daily study time
-        daily_data = filtered_data.groupby('date')['duration_minutes'].sum().reset_index()
+        # Study time per day, or per week/month when there would be too many bars
+        daily_data, resolution = resample_rollup(period_rollup)
         daily_data['date'] = pd.to_datetime(daily_data['date'])
         
         fig = px.bar(daily_data, x='date', y='duration_minutes',
-                    title="Daily Study Time Distribution")
+                    title=f"{RESOLUTION_LABELS[resolution]} Study Time Distribution")
         st.plotly_chart(fig, use_container_width=True)
     
     with tab2:
-        # Confidence over time
-        confidence_data = filtered_data.copy()
-        confidence_data['date'] = pd.to_datetime(confidence_data['date'])
-        
-        fig = px.scatter(confidence_data, x='date', y='confidence_rating',
-                        color='subject', title="Confidence Rating Over Time")
+        # Confidence over time; long histories are binned into per-subject
+        # daily/weekly/monthly means sized by their session count
+        confidence_data, resolution = bin_scatter(filtered_data)
+        confidence_data = confidence_data.assign(date=pd.to_datetime(confidence_data['date']))
+        
+        if resolution is None:
+            fig = px.scatter(confidence_data, x='date', y='confidence_rating',
+                            color='subject', title="Confidence Rating Over Time")
+        else:
+            fig = px.scatter(confidence_data, x='date', y='confidence_rating', size='sessions',
+                            color='subject', size_max=15,
+                            title=f"Average Confidence Rating Over Time ({RESOLUTION_LABELS[resolution].lower()})")
         st.plotly_chart(fig, use_container_width=True)
     
     with tab3:
         # Subject performance
-        subject_stats = filtered_data.groupby('subject').agg({
-            'duration_minutes': 'sum',
-            'confidence_rating': 'mean'
-        }).reset_index()
+        subject_stats = subject_totals(period_rollup)
         
         fig = px.bar(subject_stats, x='subject', y='duration_minutes',
                     title="Total Study Time by Subject")
@@ -387,21 +438,56 @@ def show_progress_reports():
     
     # Export option
     st.subheader("Export Report")
-    if st.button("Download PDF Report"):
-        try:
-            pdf_exporter = PDFExporter()
-            pdf_buffer = pdf_exporter.generate_report(
-                st.session_state.current_user, filtered_data, period
-            )
-            
-            st.download_button(
-                label="Download PDF",
-                data=pdf_buffer,
-                file_name=f"study_report_{st.session_state.current_user}_{period.replace(' ', '_')}.pdf",
-                mime="application/pdf"
-            )
-        except Exception as e:
-            st.error(f"Failed to generate PDF: {str(e)}")
+    include_full_history = st.checkbox(
+        "Include full session history appendix",
+        help=f"Adds every one of the {len(filtered_data):,} sessions in this period as an appendix."
+    )
+    if st.button("Generate PDF Report"):
+        from report_jobs import get_report_jobs
+
+        # rendered on a background thread; identical in-flight requests share a job
+        st.session_state.report_job_id = get_report_jobs().submit(
+            st.session_state.current_user, filtered_data, period,
+            include_full_history=include_full_history
+        )
+    
+    if st.session_state.get('report_job_id'):
+        show_report_job(st.session_state.report_job_id)
+
+def show_report_job(job_id):
+    from report_jobs import get_report_jobs
+
+    jobs = get_report_jobs()
+    job = jobs.job(job_id)
+    if job is None:
+        del st.session_state.report_job_id
+        return
+    polling = job['status'] in ("queued", "running")
+
+    @st.fragment(run_every=0.5 if polling else None)
+    def job_status():
+        job = jobs.job(job_id)
+        if job is None:
+            return
+        if job['status'] in ("queued", "running"):
+            section = (job['section'] or "queued").replace("_", " ")
+            st.progress(job['progress'], text=f"Generating {job['period']} report: {section}...")
+            return
+        if polling:
+            # finished since the page rendered: rerun once to stop polling
+            st.rerun()
+
+        if job['status'] == "failed":
+            st.error(f"Failed to generate PDF: {job['error']}")
+            return
+        st.download_button(
+            label="Download PDF",
+            data=jobs.result(job_id),
+            file_name=f"study_report_{job['username']}_{job['period'].replace(' ', '_')}.pdf",
+            mime="application/pdf"
+        )
+
+    job_status()
 
 def show_settings():
     st.header("Settings")
@@ -410,10 +496,10 @@ def show_settings():
     
     with tab1:
         st.subheader("Profile Information")
-        user_data = st.session_state.data_manager.get_user_data(st.session_state.current_user)
+        user_data = st.session_state.data_context.user_data
         
         if not user_data.empty:
-            first_session = user_data['date'].min()
+            first_session = user_data['date'].min().date()
             total_sessions = len(user_data)
             total_time = user_data['duration_minutes'].sum()
             
@@ -426,7 +512,7 @@ def show_settings():
         
         # Export all data
         if st.button("Export All Data (CSV)"):
-            user_data = st.session_state.data_manager.get_user_data(st.session_state.current_user)
+            user_data = st.session_state.data_context.user_data
             csv = user_data.to_csv(index=False)
             st.download_button(
                 label="Download CSV",
@@ -441,7 +527,9 @@ def show_settings():
         st.subheader("Danger Zone")
         if st.button("Delete All Data", type="secondary"):
             if st.button("Confirm Delete", type="secondary"):
-                if st.session_state.data_manager.delete_user_data(st.session_state.current_user):
+                if st.session_state.data_context.delete_user_data():
+                    from report_cache import get_report_cache
+                    get_report_cache().invalidate_user(st.session_state.current_user)
                     st.success("All data deleted successfully!")
                     st.rerun()
                 else:
@@ -454,9 +542,168 @@ def show_settings():
         st.subheader("Display Preferences")
         st.info("Using default Streamlit theme for optimal performance.")
 
+def show_diagnostics():
+    from profiling import profiler
+    from placement_model import get_registry
+
+    st.header("Diagnostics")
+    st.markdown("Per-stage timings collected by the opt-in profiler (process-wide, all sessions).")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        enabled = st.toggle("Enable profiling", value=profiler.enabled)
+        if enabled != profiler.enabled:
+            if enabled:
+                profiler.enable()
+            else:
+                profiler.disable()
+    with col2:
+        if st.button("Reset timings"):
+            profiler.reset()
+
+    with st.expander("Placement model registry"):
+        st.json(get_registry().metrics())
+        from prediction_service import get_service
+        st.json(get_service().metrics())
+        from prediction_cache import get_prediction_cache
+        st.markdown("**Prediction cache**")
+        st.json(get_prediction_cache().metrics())
+
+    with st.expander("Data context (this rerun)"):
+        st.json(st.session_state.data_context.metrics())
+        from data_store import memory_report
+        report = memory_report(st.session_state.data_context.user_data)
+        st.markdown(f"**Study data in memory:** {report['rows']:,} sessions, {report['total_bytes'] / 1024:,.1f} KB")
+        st.dataframe(pd.DataFrame(report['columns']).T, use_container_width=True)
+
+    with st.expander("Session history index"):
+        from session_index import get_session_index_cache
+        st.json(get_session_index_cache().metrics())
+
+    with st.expander("PDF report cache and jobs"):
+        from report_cache import get_report_cache
+        from report_jobs import get_report_jobs
+        st.json(get_report_cache().metrics())
+        st.json(get_report_jobs().metrics())
+        from pdf_charts import chart_cache
+        st.markdown("**Chart cache**")
+        st.json(chart_cache.metrics())
+
+    summary = profiler.summary()
+    if not summary:
+        st.info("No stages recorded yet. Enable profiling and visit the other pages.")
+        return
+
+    st.subheader("Stage Summary")
+    st.dataframe(pd.DataFrame(summary).round(2), use_container_width=True)
+
+    with st.expander("Raw stage records"):
+        st.dataframe(pd.DataFrame(profiler.records()).round(2), use_container_width=True)
+
+def show_batch_placement_prediction():
+    from placement_batch import FEATURE_COLUMNS, score_csv, template_csv
+
+    st.subheader("Batch Prediction")
+    st.markdown(
+        "Upload a CSV with one candidate per row and these columns (extra columns are kept): "
+        + ", ".join(f"`{c}`" for c in FEATURE_COLUMNS)
+        + ". `PlacementTraining` accepts Yes/No; `ExtracurricularActivities` is a 1-10 rating as in the form."
+    )
+    st.download_button("Download CSV template", data=template_csv(),
+                       file_name="placement_candidates_template.csv", mime="text/csv")
+
+    uploaded = st.file_uploader("Candidates CSV", type=["csv"])
+    if uploaded is None:
+        return
+
+    if st.button("Score Candidates"):
+        progress_bar = st.progress(0, text="Scoring candidates...")
+        try:
+            csv_bytes, summary = score_csv(
+                uploaded,
+                progress=lambda done: progress_bar.progress(done, text=f"Scoring candidates... {done:.0%}"),
+            )
+        except Exception as e:
+            st.error(f"Failed to score file: {str(e)}")
+            return
+        finally:
+            progress_bar.empty()
+
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Candidates Scored", summary['scored'])
+        with col2:
+            st.metric("Likely Placed", summary['placed'])
+        with col3:
+            st.metric("Invalid Rows", summary['invalid'])
+        if summary['invalid']:
+            st.warning("Some rows were skipped; see the `status` column in the results.")
+
+        st.download_button(
+            label="Download Predictions",
+            data=csv_bytes,
+            file_name=f"placement_predictions_{uploaded.name}",
+            mime="text/csv"
+        )
+
+def show_placement_sensitivity(base_row):
+    import plotly.graph_objects as go
+    from placement_model import FEATURE_COLUMNS
+    from placement_sensitivity import nearest_flip, sensitivity_sweep
+
+    st.subheader("What-if Analysis")
+    st.markdown("See how the placement probability changes as one or two of your inputs vary, "
+                "with everything else held at the values above.")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        x_feature = st.selectbox("Vary", FEATURE_COLUMNS, index=FEATURE_COLUMNS.index("Projects"))
+    with col2:
+        y_options = ["None"] + [f for f in FEATURE_COLUMNS if f != x_feature]
+        y_feature = st.selectbox("Against", y_options)
+    y_feature = None if y_feature == "None" else y_feature
+
+    sweep = sensitivity_sweep(base_row, x_feature, y_feature)
+    base_x = sweep['base_row'][FEATURE_COLUMNS.index(x_feature)]
+
+    if y_feature is None:
+        fig = go.Figure(go.Scatter(x=sweep['x'], y=sweep['probability'], mode='lines', name='Probability'))
+        fig.add_hline(y=0.5, line_dash="dash", annotation_text="Decision boundary")
+        fig.add_vline(x=base_x, line_dash="dot", annotation_text="You")
+        fig.update_layout(xaxis_title=x_feature, yaxis_title="Placement probability", yaxis_range=[0, 1])
+    else:
+        base_y = sweep['base_row'][FEATURE_COLUMNS.index(y_feature)]
+        fig = go.Figure(go.Heatmap(x=sweep['x'], y=sweep['y'], z=sweep['probability'],
+                                   zmin=0, zmax=1, colorscale="RdYlGn",
+                                   colorbar=dict(title="Probability")))
+        fig.add_trace(go.Contour(x=sweep['x'], y=sweep['y'], z=sweep['probability'],
+                                 contours=dict(start=0.5, end=0.5, coloring='none', showlabels=True),
+                                 line=dict(color='black', width=2), showscale=False, name="Decision boundary"))
+        fig.add_trace(go.Scatter(x=[base_x], y=[base_y], mode='markers',
+                                 marker=dict(size=12, color='black', symbol='x'), name="You"))
+        fig.update_layout(xaxis_title=x_feature, yaxis_title=y_feature)
+
+    st.plotly_chart(fig, use_container_width=True)
+    st.caption(f"{sweep['evaluations']:,} profiles scored in one batched prediction.")
+
+    outcome = "likely to be Placed" if sweep['base_prediction'] == 1 else "unlikely to be Placed"
+    st.markdown(f"Current estimate: **{outcome}** (probability {sweep['base_probability']:.0%}).")
+
+    flip = nearest_flip(sweep)
+    if flip is None:
+        st.info("No value in this range changes the predicted outcome.")
+    else:
+        changes = ", ".join(
+            f"{feature} from {sweep['base_row'][FEATURE_COLUMNS.index(feature)]:g} to {value:g}"
+            for feature, value in flip.items()
+        )
+        st.markdown(f"Smallest change that flips the outcome: **{changes}**.")
+
 def show_placement_prediction():
-    import pickle
     import numpy as np
+    from placement_model import get_registry
+    from prediction_service import get_service
+    from prediction_cache import get_prediction_cache
 
     st.header("Placement Prediction")
     st.markdown("- *based* *on* *Kaggle* *Dataset*")
@@ -492,11 +739,10 @@ def show_placement_prediction():
         """)
 
 
-    # Load model + scaler
-    with open("scaler.pkl", "rb") as f:
-        scaler = pickle.load(f)
-    with open("placement_prediction_model.pkl", "rb") as f:
-        model = pickle.load(f)
+    mode = st.radio("Mode", ["Single candidate", "What-if analysis", "Batch (CSV upload)"], horizontal=True)
+    if mode == "Batch (CSV upload)":
+        show_batch_placement_prediction()
+        return
 
     # Input fields (same 10 features, exclude StudentID)
     cgpa = st.number_input("CGPA", 0.0, 10.0, 7.0, step=0.1)
@@ -518,35 +764,25 @@ def show_placement_prediction():
         ssc_marks, hsc_marks
     ]).reshape(1, -1)
 
-    features_scaled = scaler.transform(features)
+    if mode == "What-if analysis":
+        show_placement_sensitivity(features[0])
+        return
 
     if st.button("Predict Placement"):
-        prediction = model.predict(features_scaled)[0]
-        import time
-        random.seed(132)
-        progress_bar = st.progress(0)
-        placeholder = st.empty()
-        placeholder.subheader('Predicting  Placement') 
-        
-        place = st.empty()
-        place.image('https://cdn.dribbble.com/userupload/23163669/file/original-33613fcd16243932816ae19cd4d8501d.gif',width = 330)
-        
-        for i in range(100):
-            time.sleep(0.05)
-            progress_bar.progress(i + 1)
-        
+        # progress follows the actual steps; the model load is a no-op once
+        # the registry is warm, so most clicks finish in milliseconds
+        progress_bar = st.progress(0, text="Loading placement model...")
+        get_registry().get()
+        progress_bar.progress(50, text="Scaling and scoring features...")
+        # repeated inputs are served from the LRU; misses go through the
+        # micro-batching service so concurrent users share one predict call
+        prediction, _ = get_prediction_cache().predict(features[0], get_service().predict)
+        progress_bar.empty()
+
         if prediction == 1:
-            body = f'Candidate is likely to be Placed.'
-            placeholder.empty()
-            place.empty()
-            st.success(body)
-            progress_bar = st.progress(0)
+            st.success('Candidate is likely to be Placed.')
         else:
-            body = 'Candidate is unlikely to be Placed.'
-            placeholder.empty()
-            place.empty()
-            st.warning(body)
-            progress_bar = st.progress(0)
+            st.warning('Candidate is unlikely to be Placed.')
 
 if __name__ == "__main__":
     main()
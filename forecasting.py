@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+
+
+def forecast_topic_trends(user_data, horizon_days=7, halflife_days=14, min_sessions=2):
+    """Fit an exponentially weighted linear trend of confidence per topic.
+
+    All topics are fitted at once: each session contributes its weighted
+    moments to its topic through np.bincount, and the closed-form weighted
+    least squares solution is evaluated on the resulting per-topic arrays.
+    Runtime is O(sessions + topics) with no per-topic Python loop.
+
+    Returns a DataFrame with one row per (subject, chapter):
+        sessions, last_date, ewma_confidence, trend_per_day,
+        projected_confidence, residual_std (weighted fit error).
+    projected_confidence is taken at one common date for all topics, the
+    user's most recent study day (over every topic) + horizon_days, and
+    clipped to the 1-5 scale; each topic's trend is fitted relative to its
+    own last_date, so topics not studied lately extrapolate further.
+    Topics with fewer than min_sessions sessions or a single study day get
+    a flat trend, i.e. their projection equals their EWMA. Sessions with a
+    missing subject or chapter are ignored, as a groupby would drop them.
+    """
+    columns = ['subject', 'chapter', 'sessions', 'last_date', 'ewma_confidence',
+               'trend_per_day', 'projected_confidence', 'residual_std']
+    # sessions without a subject or chapter belong to no topic (factorize would code them -1)
+    user_data = user_data.dropna(subset=['subject', 'chapter'])
+    if user_data.empty:
+        return pd.DataFrame(columns=columns)
+
+    codes, topics = pd.MultiIndex.from_frame(user_data[['subject', 'chapter']]).factorize()
+    n_topics = len(topics)
+
+    days = pd.to_datetime(user_data['date']).values.astype('datetime64[D]').astype(np.int64).astype(float)
+    y = user_data['confidence_rating'].to_numpy(dtype=float)
+
+    # time relative to each topic's most recent session (<= 0)
+    last_day = np.full(n_topics, -np.inf)
+    np.maximum.at(last_day, codes, days)
+    t = days - last_day[codes]
+
+    # exponential decay weights, newest session of every topic has weight 1
+    w = np.power(0.5, -t / halflife_days)
+
+    def weighted_sum(values):
+        return np.bincount(codes, weights=values, minlength=n_topics)
+
+    counts = np.bincount(codes, minlength=n_topics)
+    s0 = weighted_sum(w)
+    s1 = weighted_sum(w * t)
+    s2 = weighted_sum(w * t * t)
+    sy = weighted_sum(w * y)
+    sty = weighted_sum(w * t * y)
+    syy = weighted_sum(w * y * y)
+
+    denom = s0 * s2 - s1 * s1
+    fit = (counts >= min_sessions) & (denom > 1e-9 * np.maximum(s0 * s2, 1.0))
+
+    slope = np.zeros(n_topics)
+    slope[fit] = (s0[fit] * sty[fit] - s1[fit] * sy[fit]) / denom[fit]
+    ewma = sy / s0
+    intercept = (sy - slope * s1) / s0  # fitted value at the topic's last session
+
+    # project from a common reference date so stale topics extrapolate further
+    reference_day = last_day.max() + horizon_days
+    projected = np.clip(intercept + slope * (reference_day - last_day), 1, 5)
+
+    rss = syy - intercept * sy - slope * sty
+    residual_std = np.sqrt(np.maximum(rss, 0) / s0)
+
+    return pd.DataFrame({
+        'subject': topics.get_level_values(0),
+        'chapter': topics.get_level_values(1),
+        'sessions': counts,
+        'last_date': last_day.astype('int64').astype('datetime64[D]'),
+        'ewma_confidence': ewma,
+        'trend_per_day': slope,
+        'projected_confidence': projected,
+        'residual_std': residual_std,
+    }, columns=columns)
@@ -1,7 +1,9 @@
+import numpy as np
 import pandas as pd
-from datetime import datetime, timedelta
 import math
 
+from profiling import stage
+
 class GamificationSystem:
     def __init__(self):
         # XP calculation constants
@@ -51,47 +53,33 @@ class GamificationSystem:
         total_xp = 0
         
         # XP from study sessions
-        for _, session in user_data.iterrows():
-            # Calculate streak for this session date
-            streak = self._calculate_streak_for_date(user_data, session['date'])
-            session_xp = self.calculate_session_xp(
-                session['duration_minutes'],
-                session['confidence_rating'],
-                streak
-            )
-            total_xp += session_xp
+        with stage("gamification.total_xp", rows=len(user_data)):
+            streaks = self._session_streaks(user_data)
+            durations = user_data['duration_minutes'].tolist()
+            confidences = user_data['confidence_rating'].tolist()
+            for duration, confidence, streak in zip(durations, confidences, streaks.tolist()):
+                total_xp += self.calculate_session_xp(duration, confidence, streak)
         
         return total_xp
     
-    def _calculate_streak_for_date(self, user_data, target_date):
-        """Calculate streak days up to a specific date"""
-        # Convert target_date to datetime if it's not already
-        if isinstance(target_date, str):
-            target_date = pd.to_datetime(target_date).date()
-        elif isinstance(target_date, pd.Timestamp):
-            target_date = target_date.date()
-        
-        # Get all unique study dates up to target date
-        study_dates = user_data[user_data['date'] <= target_date]['date'].unique()
-        study_dates = pd.to_datetime(study_dates).date if len(study_dates) > 0 else []
-        study_dates = sorted(study_dates, reverse=True)
-        
-        if not study_dates or study_dates[0] != target_date:
-            return 0
-        
-        # Calculate consecutive days
-        streak = 1
-        current_date = study_dates[0]
-        
-        for date in study_dates[1:]:
-            expected_date = current_date - timedelta(days=1)
-            if date == expected_date:
-                streak += 1
-                current_date = date
-            else:
-                break
-        
-        return streak
+    def _session_streaks(self, user_data):
+        """Streak days up to and including each session's date, per session.
+        
+        The column is parsed once into sorted unique study days; the streak
+        ending on each of those days is the position within its run of
+        consecutive days, and every session looks its day up with
+        searchsorted.
+        """
+        days = pd.to_datetime(user_data['date']).to_numpy().astype('datetime64[D]').astype(np.int64)
+        study_days = np.unique(days)
+        
+        # a run of consecutive days starts wherever the gap to the previous study day isn't 1
+        positions = np.arange(len(study_days))
+        starts_run = np.diff(study_days, prepend=study_days[0] - 2) != 1
+        run_start = np.maximum.accumulate(np.where(starts_run, positions, 0))
+        streak_by_day = positions - run_start + 1
+        
+        return streak_by_day[np.searchsorted(study_days, days)]
     
     def get_level(self, total_xp):
         """Get current level based on total XP"""
@@ -124,6 +112,10 @@ class GamificationSystem:
     
     def check_achievements(self, user_data, quiz_data=None):
         """Check which achievements the user has earned"""
+        with stage("gamification.achievements", rows=len(user_data)):
+            return self._check_achievements(user_data, quiz_data)
+    
+    def _check_achievements(self, user_data, quiz_data=None):
         earned_achievements = []
         
         if user_data.empty:
@@ -157,7 +149,7 @@ class GamificationSystem:
                 earned_achievements.append("perfect_week")
         
         # Subject expert achievement
-        subject_confidence = user_data.groupby('subject')['confidence_rating'].mean()
+        subject_confidence = user_data.groupby('subject', observed=True)['confidence_rating'].mean()
         if any(conf >= 4.0 for conf in subject_confidence.values):
             earned_achievements.append("subject_expert")
         
@@ -1,16 +1,18 @@
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
 import warnings
+
+from profiling import stage
+from forecasting import forecast_topic_trends
+from recommendations import engine
+
 warnings.filterwarnings('ignore')
 
 class MLAnalyzer:
     def __init__(self):
         self.weakness_threshold = 3.0  # Confidence rating below this is considered weak
         self.min_sessions_for_analysis = 3  # Minimum sessions per topic for reliable analysis
+        self.forecast_horizon_days = 7  # How far ahead topic confidence is projected
     
     def analyze_weaknesses(self, user_data):
         """
@@ -20,17 +22,20 @@ class MLAnalyzer:
             return [], ["Need more study sessions for accurate analysis."]
         
         try:
-            # prepare data for analysis
-            topic_analysis = self._prepare_topic_analysis(user_data)
-            
-            # identify weak topics
-            weak_topics = self._identify_weak_topics(topic_analysis)
-            
-            # generate ML-powered insight
-            insights = self._generate_ml_insights(user_data, topic_analysis)
-            
-            # generate recommendations
-            recommendations = self._generate_recommendations(weak_topics, insights, user_data)
+            with stage("ml.analyze_weaknesses", rows=len(user_data)):
+                # prepare data for analysis
+                topic_analysis = self._prepare_topic_analysis(user_data)
+                
+                # identify weak topics
+                with stage("ml.weak_topics", rows=len(topic_analysis)):
+                    weak_topics = self._identify_weak_topics(topic_analysis)
+                
+                # generate ML-powered insight
+                insights = self._generate_ml_insights(user_data, topic_analysis)
+                
+                # generate recommendations
+                with stage("ml.recommendations", rows=len(user_data)):
+                    recommendations = self._generate_recommendations(weak_topics, insights, user_data)
             
             return weak_topics, recommendations
             
@@ -39,15 +44,17 @@ class MLAnalyzer:
     
     def _prepare_topic_analysis(self, user_data):
         """Prepare topic-level analysis"""
-        topic_stats = user_data.groupby(['subject', 'chapter']).agg({
-            'confidence_rating': ['mean', 'std', 'count'],
-            'duration_minutes': ['sum', 'mean'],
-            'date': ['min', 'max']
-        }).round(2)
-        
-        # flatten column names
-        topic_stats.columns = ['_'.join(col).strip() for col in topic_stats.columns.values]
-        topic_stats = topic_stats.reset_index()
+        with stage("ml.topic_groupby", rows=len(user_data)) as record:
+            topic_stats = user_data.groupby(['subject', 'chapter'], observed=True).agg({
+                'confidence_rating': ['mean', 'std', 'count'],
+                'duration_minutes': ['sum', 'mean'],
+                'date': ['min', 'max']
+            }).round(2)
+            
+            # flatten column names
+            topic_stats.columns = ['_'.join(col).strip() for col in topic_stats.columns.values]
+            topic_stats = topic_stats.reset_index()
+            record['topics'] = len(topic_stats)
         
         # Calculate additional metrics
         topic_stats['days_studied'] = (
@@ -59,11 +66,12 @@ class MLAnalyzer:
         ).fillna(0)
         
         # Calculate improvement trend
-        topic_stats['improvement_trend'] = topic_stats.apply(
-            lambda row: self._calculate_improvement_trend(
-                user_data, row['subject'], row['chapter']
-            ), axis=1
-        )
+        with stage("ml.improvement_trends", rows=len(topic_stats)):
+            topic_stats['improvement_trend'] = topic_stats.apply(
+                lambda row: self._calculate_improvement_trend(
+                    user_data, row['subject'], row['chapter']
+                ), axis=1
+            )
         
         return topic_stats
     
@@ -136,11 +144,13 @@ class MLAnalyzer:
             insights['clusters'] = clusters
             
             # performance prediction
-            performance_prediction = self._predict_performance_trends(user_data)
+            with stage("ml.performance_trends", rows=len(user_data)):
+                performance_prediction = self._predict_performance_trends(user_data)
             insights['performance_prediction'] = performance_prediction
             
             # study pattern analysis
-            study_patterns = self._analyze_study_patterns(user_data)
+            with stage("ml.study_patterns", rows=len(user_data)):
+                study_patterns = self._analyze_study_patterns(user_data)
             insights['study_patterns'] = study_patterns
             
         except Exception as e:
@@ -158,20 +168,27 @@ class MLAnalyzer:
             'consistency_score'
         ]].fillna(0)
         
+        from sklearn.preprocessing import StandardScaler
+
         # normalize features
-        scaler = StandardScaler()
-        normalized_features = scaler.fit_transform(features)
+        with stage("ml.scaling", rows=len(features)):
+            scaler = StandardScaler()
+            normalized_features = scaler.fit_transform(features)
         
         return normalized_features
     
     def _perform_clustering(self, features):
         """Cluster topics by similarity"""
+        from sklearn.cluster import KMeans
+
         try:
             # determine optimal number of clusters (2-4)
             n_clusters = min(4, max(2, len(features) // 2))
             
-            kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init='auto')
-            cluster_labels = kmeans.fit_predict(features)
+            with stage("ml.kmeans", rows=len(features)) as record:
+                kmeans = KMeans(n_clusters=n_clusters, random_state=42, n_init='auto')
+                cluster_labels = kmeans.fit_predict(features)
+                record['n_clusters'] = n_clusters
             
             return {
                 'labels': cluster_labels.tolist(),
@@ -184,6 +201,12 @@ class MLAnalyzer:
     def _predict_performance_trends(self, user_data):
         """Predict performance trends using time series analysis"""
         try:
+            # per-topic EWMA/linear trend forecast, fitted for all topics at once
+            with stage("ml.topic_forecast", rows=len(user_data)) as record:
+                forecasts = forecast_topic_trends(user_data, horizon_days=self.forecast_horizon_days)
+                record['topics'] = len(forecasts)
+            topic_forecasts = forecasts.sort_values('projected_confidence').to_dict('records')
+            
             # aggregate daily performance
             daily_performance = user_data.groupby('date').agg({
                 'confidence_rating': 'mean',
@@ -191,16 +214,12 @@ class MLAnalyzer:
             }).reset_index()
             
             if len(daily_performance) < 7:
-                return {"status": "insufficient_history"}
+                return {"status": "insufficient_history", "topic_forecasts": topic_forecasts}
             
             # simple trend analysis
             daily_performance['date'] = pd.to_datetime(daily_performance['date'])
             daily_performance = daily_performance.sort_values('date')
             
-            # calculate rolling averages
-            daily_performance['confidence_trend'] = daily_performance['confidence_rating'].rolling(3).mean()
-            daily_performance['time_trend'] = daily_performance['duration_minutes'].rolling(3).mean()
-            
             # calculate overall trends
             recent_confidence = daily_performance['confidence_rating'].tail(7).mean()
             older_confidence = daily_performance['confidence_rating'].head(7).mean()
@@ -214,6 +233,7 @@ class MLAnalyzer:
                 'confidence_trend': confidence_trend,
                 'time_trend': time_trend,
                 'recent_performance': recent_confidence,
+                'topic_forecasts': topic_forecasts,
                 'status': 'success'
             }
             
@@ -226,13 +246,15 @@ class MLAnalyzer:
             patterns = {}
             
             # time of day analysis (if timestamp available)
+            # (grouping by derived series rather than new columns, so the
+            # caller's frame and its data fingerprint are left untouched)
             if 'timestamp' in user_data.columns:
-                user_data['hour'] = pd.to_datetime(user_data['timestamp']).dt.hour
-                patterns['peak_hours'] = user_data.groupby('hour')['duration_minutes'].sum().idxmax()
+                hour = pd.to_datetime(user_data['timestamp']).dt.hour
+                patterns['peak_hours'] = user_data['duration_minutes'].groupby(hour).sum().idxmax()
             
             # day of week patterns
-            user_data['day_of_week'] = pd.to_datetime(user_data['date']).dt.day_name()
-            patterns['most_productive_day'] = user_data.groupby('day_of_week')['confidence_rating'].mean().idxmax()
+            day_of_week = pd.to_datetime(user_data['date']).dt.day_name()
+            patterns['most_productive_day'] = user_data['confidence_rating'].groupby(day_of_week).mean().idxmax()
             
             # session length patterns
             patterns['avg_session_length'] = user_data['duration_minutes'].mean()
@@ -240,7 +262,7 @@ class MLAnalyzer:
             
             # subject switching patterns
             patterns['subject_diversity'] = user_data['subject'].nunique()
-            patterns['most_studied_subject'] = user_data.groupby('subject')['duration_minutes'].sum().idxmax()
+            patterns['most_studied_subject'] = user_data.groupby('subject', observed=True)['duration_minutes'].sum().idxmax()
             
             return patterns
             
@@ -249,60 +271,4 @@ class MLAnalyzer:
     
     def _generate_recommendations(self, weak_topics, insights, user_data):
         """Generate personalized recommendations based on analysis"""
-        recommendations = []
-        
-        # weakness-based recommendations
-        if weak_topics:
-            top_weak = weak_topics[:3]
-            topic_list = ', '.join([f"{t['subject']} - {t['chapter']}" for t in top_weak])
-            recommendations.append(f"Focus on these weak areas: {topic_list}")
-            
-            for topic in top_weak:
-                if topic['improvement_trend'] < 0:
-                    recommendations.append(f" {topic['subject']} - {topic['chapter']}: Try different study methods, confidence is declining")
-                elif topic['sessions'] < 5:
-                    recommendations.append(f" {topic['subject']} - {topic['chapter']}: Needs more practice sessions")
-        
-        # pattern-based recommendations
-        if 'study_patterns' in insights and insights['study_patterns'].get('status') != 'pattern_analysis_failed':
-            patterns = insights['study_patterns']
-            
-            if 'most_productive_day' in patterns:
-                recommendations.append(f"You perform best on {patterns['most_productive_day']}s - consider scheduling important topics then")
-            
-            if 'avg_session_length' in patterns:
-                avg_length = patterns['avg_session_length']
-                if avg_length < 20:
-                    recommendations.append("Consider longer study sessions (20-45 minutes) for better retention")
-                elif avg_length > 90:
-                    recommendations.append("Break down long sessions into smaller chunks with breaks")
-        
-        # performance trend recommendations
-        if 'performance_prediction' in insights and insights['performance_prediction'].get('status') == 'success':
-            pred = insights['performance_prediction']
-            
-            if pred['confidence_trend'] < -0.2:
-                recommendations.append("Your confidence has been declining recently - consider reviewing fundamentals")
-            elif pred['confidence_trend'] > 0.2:
-                recommendations.append("Great progress! Your confidence is improving - keep up the momentum")
-            
-            if pred['time_trend'] < -10:
-                recommendations.append("You've been studying less lately - try to maintain consistency")
-        
-        # General Recommendations
-        if len(user_data) >= 10:
-            recent_consistency = len(user_data[user_data['date'] >= (user_data['date'].max() - pd.Timedelta(days=7))])
-            if recent_consistency < 3:
-                recommendations.append("Try to study more consistently - aim for at least 3 sessions per week")
-        
-        # subject diversity recommendations
-        subject_count = user_data['subject'].nunique()
-        if subject_count == 1:
-            recommendations.append("Consider diversifying your subjects to maintain engagement")
-        elif subject_count > 5:
-            recommendations.append("You're studying many subjects - ensure you're giving enough attention to each")
-        
-        if not recommendations:
-            recommendations.append("Great job! No major issues detected. Keep maintaining your study routine!")
-        
-        return recommendations[:6]  # Limit to 6 recommendations
\ No newline at end of file
+        return engine.recommend(user_data, "analysis", weak_topics=weak_topics, insights=insights)
@@ -0,0 +1,160 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.linecharts import HorizontalLineChart
+from reportlab.graphics.charts.piecharts import Pie
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+
+# Points per time-series chart; longer histories are averaged into buckets
+MAX_CHART_POINTS = 90
+MAX_AXIS_LABELS = 8
+MAX_PIE_SLICES = 8
+
+CHART_WIDTH = 6 * inch
+CHART_HEIGHT = 2.4 * inch
+
+PALETTE = [colors.HexColor(c) for c in
+           ('#2E86AB', '#A23B72', '#F18F01', '#C73E1D', '#3B1F2B', '#6A994E', '#8D6A9F', '#5BC0EB', '#9E9E9E')]
+
+
+def bucket_series(dates, values, max_points=MAX_CHART_POINTS):
+    """Average a daily series into at most max_points consecutive buckets.
+
+    Returns (labels, values) where each label is the first date of its bucket.
+    """
+    dates = np.asarray(dates)
+    values = np.asarray(values, dtype=float)
+    if len(values) <= max_points:
+        return dates, values
+
+    bucket = np.arange(len(values)) * max_points // len(values)
+    counts = np.bincount(bucket)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    return dates[starts], np.bincount(bucket, weights=values) / counts
+
+
+def _axis_labels(dates):
+    """Date labels with all but ~MAX_AXIS_LABELS of them blanked"""
+    step = max(1, -(-len(dates) // MAX_AXIS_LABELS))
+    labels = np.datetime_as_string(np.asarray(dates, dtype='datetime64[D]'))
+    return [label[5:] if i % step == 0 else "" for i, label in enumerate(labels)]
+
+
+def _titled_drawing(title):
+    drawing = Drawing(CHART_WIDTH, CHART_HEIGHT)
+    drawing.add(String(0, CHART_HEIGHT - 12, title, fontName='Helvetica-Bold', fontSize=10))
+    return drawing
+
+
+def daily_time_chart(daily, max_points=MAX_CHART_POINTS):
+    """Bar chart of study minutes per day (bucket averages for long histories)"""
+    dates, minutes = bucket_series(daily['date'].to_numpy(), daily['duration_minutes'].to_numpy(), max_points)
+    bucketed = len(minutes) < len(daily)
+    drawing = _titled_drawing("Average Daily Study Time (min)" if bucketed else "Daily Study Time (min)")
+
+    chart = VerticalBarChart()
+    chart.x, chart.y = 40, 30
+    chart.width, chart.height = CHART_WIDTH - 50, CHART_HEIGHT - 60
+    chart.data = [minutes.round(1).tolist()]
+    chart.categoryAxis.categoryNames = _axis_labels(dates)
+    chart.categoryAxis.labels.fontSize = 7
+    chart.categoryAxis.labels.angle = 30
+    chart.categoryAxis.labels.boxAnchor = 'ne'
+    chart.categoryAxis.tickDown = 0
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.labels.fontSize = 7
+    chart.bars[0].fillColor = PALETTE[0]
+    chart.bars[0].strokeColor = None
+    drawing.add(chart)
+    return drawing
+
+
+def confidence_chart(daily, max_points=MAX_CHART_POINTS):
+    """Line chart of the average confidence rating over time"""
+    dates, confidence = bucket_series(daily['date'].to_numpy(), daily['avg_confidence'].to_numpy(), max_points)
+    drawing = _titled_drawing("Average Confidence Over Time (1-5)")
+
+    chart = HorizontalLineChart()
+    chart.x, chart.y = 40, 30
+    chart.width, chart.height = CHART_WIDTH - 50, CHART_HEIGHT - 60
+    chart.data = [confidence.round(2).tolist()]
+    chart.categoryAxis.categoryNames = _axis_labels(dates)
+    chart.categoryAxis.labels.fontSize = 7
+    chart.categoryAxis.labels.angle = 30
+    chart.categoryAxis.labels.boxAnchor = 'ne'
+    chart.valueAxis.valueMin = 1
+    chart.valueAxis.valueMax = 5
+    chart.valueAxis.valueStep = 1
+    chart.valueAxis.labels.fontSize = 7
+    chart.lines[0].strokeColor = PALETTE[1]
+    chart.lines[0].strokeWidth = 1.5
+    drawing.add(chart)
+    return drawing
+
+
+def subject_distribution_chart(subject_stats):
+    """Pie chart of study time per subject, small subjects folded into 'Other'"""
+    stats = subject_stats.sort_values('Total_Time', ascending=False)
+    names = stats['subject'].astype(str).tolist()
+    minutes = stats['Total_Time'].to_numpy(dtype=float)
+    if len(names) > MAX_PIE_SLICES:
+        names = names[:MAX_PIE_SLICES - 1] + ["Other"]
+        minutes = np.append(minutes[:MAX_PIE_SLICES - 1], minutes[MAX_PIE_SLICES - 1:].sum())
+    share = minutes / minutes.sum() * 100 if minutes.sum() else minutes
+
+    drawing = _titled_drawing("Study Time by Subject")
+    pie = Pie()
+    pie.width = pie.height = CHART_HEIGHT - 45
+    pie.x, pie.y = (CHART_WIDTH - pie.width) / 2, 15  # side labels need room on both sides
+    pie.data = minutes.tolist()
+    pie.labels = [f"{name} ({pct:.0f}%)" for name, pct in zip(names, share)]
+    pie.sideLabels = True
+    pie.slices.fontSize = 7
+    pie.slices.strokeColor = colors.white
+    for i in range(len(names)):
+        pie.slices[i].fillColor = PALETTE[i % len(PALETTE)]
+    drawing.add(pie)
+    return drawing
+
+
+class ChartCache:
+    """LRU of built report chart drawings per data version"""
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_charts(self, version, aggregates):
+        """Return the list of chart drawings for this data version, building them once"""
+        with self._lock:
+            charts = self._entries.get(version)
+            if charts is not None:
+                self._entries.move_to_end(version)
+                self.hits += 1
+                return charts
+            self.misses += 1
+
+        charts = [
+            daily_time_chart(aggregates['daily']),
+            subject_distribution_chart(aggregates['subject_stats']),
+            confidence_chart(aggregates['daily']),
+        ]
+        with self._lock:
+            self._entries[version] = charts
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return charts
+
+    def metrics(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+chart_cache = ChartCache()
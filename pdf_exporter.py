@@ -1,13 +1,137 @@
 from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, LongTable, TableStyle, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from datetime import datetime, timedelta
 import pandas as pd
+import numpy as np
 import io
-from utils import format_time
+import copy
+from utils import format_time, data_fingerprint, recent_sessions
+from profiling import stage
+from recommendations import engine
+from pdf_charts import chart_cache
+
+SESSION_COLUMNS = ['Date', 'Subject', 'Chapter', 'Duration', 'Confidence']
+SESSION_COL_WIDTHS = [1*inch, 1.2*inch, 1.8*inch, 0.8*inch, 0.8*inch]
+
+# Report steps in build order, used for progress reporting
+REPORT_SECTIONS = (
+    "aggregates", "executive_summary", "detailed_statistics", "charts", "subject_breakdown",
+    "performance_analysis", "recommendations", "sessions_table", "history_appendix", "build",
+)
+
+# Rows per LongTable in the full-history appendix; splitting one huge table
+# across pages is quadratic, a chain of bounded tables stays linear
+HISTORY_CHUNK_ROWS = 500
+
+def compute_report_aggregates(user_data):
+    """Compute every aggregate the report sections need in one pass.
+    
+    Subjects, chapters, topics and days are factorized to integer codes and
+    summed with np.bincount; per-subject trends come from a single stable
+    sort instead of filtering and sorting the frame once per subject.
+    """
+    aggregates = {'empty': user_data.empty, 'rows': len(user_data)}
+    if user_data.empty:
+        return aggregates
+    
+    durations = user_data['duration_minutes'].to_numpy()
+    confidence = user_data['confidence_rating'].to_numpy()
+    dates = pd.to_datetime(user_data['date']).dt.normalize().to_numpy()
+    subjects = user_data['subject'].to_numpy()
+    
+    total_time = durations.sum()
+    unique_days, day_index = np.unique(dates, return_inverse=True)
+    aggregates.update({
+        'total_time': total_time,
+        'total_sessions': len(user_data),
+        'avg_confidence': confidence.mean(),
+        'avg_session': durations.mean(),
+        'longest_session': durations.max(),
+        'shortest_session': durations.min(),
+        'unique_days': len(unique_days),
+        'daily_avg': total_time / len(unique_days),
+    })
+    
+    ratings, rating_counts = np.unique(confidence, return_counts=True)
+    aggregates['confidence_counts'] = list(zip(ratings.tolist(), rating_counts.tolist()))
+    
+    day_sessions = np.bincount(day_index, minlength=len(unique_days))
+    aggregates['daily'] = pd.DataFrame({
+        'date': unique_days,
+        'duration_minutes': np.bincount(day_index, weights=durations, minlength=len(unique_days)),
+        'sessions': day_sessions,
+        'avg_confidence': np.bincount(day_index, weights=confidence, minlength=len(unique_days)) / day_sessions,
+    })
+    
+    # rows are reduced once at topic level with integer codes; subject
+    # figures come from the same codes
+    subject_codes, subject_order = pd.factorize(subjects, sort=True)
+    chapter_codes, chapter_order = pd.factorize(user_data['chapter'].to_numpy(), sort=True)
+    topic_codes, topic_ids = pd.factorize(subject_codes * len(chapter_order) + chapter_codes, sort=True)
+    n_topics = len(topic_ids)
+    confidence = confidence.astype(float)
+    topic_sessions = np.bincount(topic_codes, minlength=n_topics)
+    topic_confidence = np.bincount(topic_codes, weights=confidence, minlength=n_topics)
+    aggregates['chapter_confidence'] = pd.Series(
+        topic_confidence / topic_sessions,
+        index=pd.MultiIndex.from_arrays(
+            [subject_order[topic_ids // len(chapter_order)], chapter_order[topic_ids % len(chapter_order)]],
+            names=['subject', 'chapter'],
+        ),
+        name='confidence_rating',
+    )
+    aggregates['unique_chapters'] = len(chapter_order)
+    
+    n_subjects = len(subject_order)
+    counts = np.bincount(subject_codes, minlength=n_subjects)
+    subject_time = np.bincount(subject_codes, weights=durations, minlength=n_subjects)
+    subject_confidence = np.bincount(subject_codes, weights=confidence, minlength=n_subjects)
+    subject_confidence_sq = np.bincount(subject_codes, weights=confidence ** 2, minlength=n_subjects)
+    mean_confidence = subject_confidence / counts
+    with np.errstate(invalid='ignore', divide='ignore'):
+        variance = (subject_confidence_sq - counts * mean_confidence ** 2) / (counts - 1)
+    aggregates['subject_stats'] = pd.DataFrame({
+        'subject': subject_order,
+        'Total_Time': subject_time,
+        'Sessions': counts,
+        'Avg_Session': subject_time / counts,
+        'Avg_Confidence': mean_confidence,
+        'Confidence_Std': np.sqrt(np.clip(variance, 0, None)),
+    }).round(2)
+    aggregates['unique_subjects'] = n_subjects
+    
+    # per-subject trend: first third vs last third of sessions in date order
+    order = np.lexsort((dates, subject_codes))
+    sorted_codes = subject_codes[order]
+    sorted_confidence = confidence[order]
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    rank = np.arange(len(order)) - starts[sorted_codes]
+    first_n = counts // 3
+    last_n = -(-counts // 3)
+    in_first = rank < first_n[sorted_codes]
+    in_last = rank >= (counts - last_n)[sorted_codes]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        first_third = np.bincount(sorted_codes[in_first], weights=sorted_confidence[in_first],
+                                  minlength=n_subjects) / first_n
+        last_third = np.bincount(sorted_codes[in_last], weights=sorted_confidence[in_last],
+                                 minlength=n_subjects) / last_n
+    
+    trends = []
+    for code in pd.unique(subject_codes):  # order of first appearance
+        subject = subject_order[code]
+        if counts[code] >= 3:
+            trends.append({
+                'subject': subject,
+                'trend': last_third[code] - first_third[code],
+                'current_confidence': last_third[code],
+            })
+    aggregates['trends'] = trends
+    
+    return aggregates
 
 class PDFExporter:
     def __init__(self):
@@ -60,41 +184,89 @@ class PDFExporter:
             textColor=colors.HexColor('#C73E1D'),
             spaceAfter=8
         )
+        
+        # Shared by the recent sessions table and the history appendix
+        self.sessions_table_style = TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('FONTSIZE', (0, 1), (-1, -1), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ])
     
-    def generate_report(self, username, user_data, period, quiz_data=None):
-        """Generate a comprehensive study report PDF"""
+    def generate_report(self, username, user_data, period, quiz_data=None, include_full_history=False,
+                        progress=None):
+        """Generate a comprehensive study report PDF, optionally with every session appended.
+        
+        progress, if given, is called as progress(section, fraction_done)
+        before each section and with ("done", 1.0) at the end.
+        """
         buffer = io.BytesIO()
         doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=72, leftMargin=72,
                                topMargin=72, bottomMargin=18)
         
         # Container for the 'Flowable' objects
         story = []
+        rows = len(user_data)
+        sections = [s for s in REPORT_SECTIONS if include_full_history or s != "history_appendix"]
+        
+        def section(name):
+            if progress is not None:
+                progress(name, sections.index(name) / len(sections))
+            return stage(f"pdf.{name}", rows=len(story) if name == "build" else rows)
+        
+        with stage("pdf.generate_report", rows=rows):
+            # Every section reads from one shared aggregate bundle
+            with section("aggregates"):
+                aggregates = compute_report_aggregates(user_data)
+            
+            # Add title and header information
+            story.extend(self._create_header(username, period))
+            
+            # Add executive summary
+            with section("executive_summary"):
+                story.extend(self._create_executive_summary(aggregates, quiz_data))
+            
+            # Add detailed statistics
+            with section("detailed_statistics"):
+                story.extend(self._create_detailed_statistics(aggregates, quiz_data))
+            
+            # Add charts (built once per data version)
+            with section("charts"):
+                story.extend(self._create_charts(aggregates, data_fingerprint(user_data)))
+            
+            # Add subject breakdown
+            with section("subject_breakdown"):
+                story.extend(self._create_subject_breakdown(aggregates))
+            
+            # Add performance analysis
+            with section("performance_analysis"):
+                story.extend(self._create_performance_analysis(aggregates))
+            
+            # Add recommendations
+            with section("recommendations"):
+                story.extend(self._create_recommendations(user_data))
+            
+            # Add study sessions table
+            with section("sessions_table"):
+                story.extend(self._create_sessions_table(user_data))
+            
+            if include_full_history:
+                with section("history_appendix"):
+                    story.extend(self._create_history_appendix(user_data))
+            
+            # Build PDF
+            with section("build"):
+                doc.build(story)
+            buffer.seek(0)
         
-        # Add title and header information
-        story.extend(self._create_header(username, period))
-        
-        # Add executive summary
-        story.extend(self._create_executive_summary(user_data, quiz_data))
-        
-        # Add detailed statistics
-        story.extend(self._create_detailed_statistics(user_data, quiz_data))
-        
-        # Add subject breakdown
-        story.extend(self._create_subject_breakdown(user_data))
-        
-        # Add performance analysis
-        story.extend(self._create_performance_analysis(user_data))
-        
-        # Add recommendations
-        story.extend(self._create_recommendations(user_data))
-        
-        # Add study sessions table
-        story.extend(self._create_sessions_table(user_data))
-        
-        # Build PDF
-        doc.build(story)
-        buffer.seek(0)
-        
+        if progress is not None:
+            progress("done", 1.0)
         return buffer.getvalue()
     
     def _create_header(self, username, period):
@@ -114,22 +286,22 @@ class PDFExporter:
         
         return story
     
-    def _create_executive_summary(self, user_data, quiz_data):
+    def _create_executive_summary(self, aggregates, quiz_data):
         """Create executive summary section"""
         story = []
         
         story.append(Paragraph("⏏︎ Executive Summary", self.subtitle_style))
         
-        if user_data.empty:
+        if aggregates['empty']:
             story.append(Paragraph("No study data available for this period.", self.normal_style))
             return story
         
-        # Calculate key metrics
-        total_time = user_data['duration_minutes'].sum()
-        total_sessions = len(user_data)
-        avg_confidence = user_data['confidence_rating'].mean()
-        unique_subjects = user_data['subject'].nunique()
-        unique_chapters = user_data['chapter'].nunique()
+        # Key metrics
+        total_time = aggregates['total_time']
+        total_sessions = aggregates['total_sessions']
+        avg_confidence = aggregates['avg_confidence']
+        unique_subjects = aggregates['unique_subjects']
+        unique_chapters = aggregates['unique_chapters']
         
         # Quiz metrics
         quiz_summary = ""
@@ -152,26 +324,26 @@ class PDFExporter:
         
         return story
     
-    def _create_detailed_statistics(self, user_data, quiz_data):
+    def _create_detailed_statistics(self, aggregates, quiz_data):
         """Create detailed statistics section"""
         story = []
         
         story.append(Paragraph("⏏︎ Detailed Statistics", self.subtitle_style))
         
-        if user_data.empty:
+        if aggregates['empty']:
             return story
         
         # Study patterns
         story.append(Paragraph("Study Patterns", self.header_style))
         
         # Daily average
-        unique_days = user_data['date'].nunique()
-        daily_avg = user_data['duration_minutes'].sum() / unique_days if unique_days > 0 else 0
+        unique_days = aggregates['unique_days']
+        daily_avg = aggregates['daily_avg']
         
         # Session length analysis
-        avg_session = user_data['duration_minutes'].mean()
-        longest_session = user_data['duration_minutes'].max()
-        shortest_session = user_data['duration_minutes'].min()
+        avg_session = aggregates['avg_session']
+        longest_session = aggregates['longest_session']
+        shortest_session = aggregates['shortest_session']
         
         patterns_text = f"""
         • <b>Daily Average Study Time:</b> {format_time(daily_avg)}<br/>
@@ -187,10 +359,9 @@ class PDFExporter:
         # Confidence analysis
         story.append(Paragraph("Confidence Analysis", self.header_style))
         
-        confidence_dist = user_data['confidence_rating'].value_counts().sort_index()
         confidence_text = "<b>Confidence Rating Distribution:</b><br/>"
-        for rating, count in confidence_dist.items():
-            percentage = (count / len(user_data)) * 100
+        for rating, count in aggregates['confidence_counts']:
+            percentage = (count / aggregates['rows']) * 100
             stars = "⭐" * rating
             confidence_text += f"• {rating} {stars}: {count} sessions ({percentage:.1f}%)<br/>"
         
@@ -199,24 +370,33 @@ class PDFExporter:
         
         return story
     
-    def _create_subject_breakdown(self, user_data):
+    def _create_charts(self, aggregates, data_version):
+        """Create the visual overview section from pre-aggregated series"""
+        story = []
+        
+        if aggregates['empty']:
+            return story
+        
+        story.append(Paragraph("⏏︎ Visual Overview", self.subtitle_style))
+        for drawing in chart_cache.get_charts(data_version, aggregates):
+            # the layout engine marks flowables it pushes to the next page,
+            # so each build gets its own shallow copy of the cached drawing
+            story.append(copy.copy(drawing))
+            story.append(Spacer(1, 12))
+        story.append(Spacer(1, 8))
+        
+        return story
+    
+    def _create_subject_breakdown(self, aggregates):
         """Create subject breakdown section"""
         story = []
         
         story.append(Paragraph("⏏︎ Subject Breakdown", self.subtitle_style))
         
-        if user_data.empty:
+        if aggregates['empty']:
             return story
         
-        # Group by subject
-        subject_stats = user_data.groupby('subject').agg({
-            'duration_minutes': ['sum', 'count', 'mean'],
-            'confidence_rating': ['mean', 'std']
-        }).round(2)
-        
-        # Flatten column names
-        subject_stats.columns = ['Total_Time', 'Sessions', 'Avg_Session', 'Avg_Confidence', 'Confidence_Std']
-        subject_stats = subject_stats.reset_index()
+        subject_stats = aggregates['subject_stats']
         
         # Create table data
         table_data = [['Subject', 'Total Time', 'Sessions', 'Avg Session', 'Avg Confidence']]
@@ -248,34 +428,21 @@ class PDFExporter:
         
         return story
     
-    def _create_performance_analysis(self, user_data):
+    def _create_performance_analysis(self, aggregates):
         """Create performance analysis section"""
         story = []
         
         story.append(Paragraph("⏏︎ Performance Analysis", self.subtitle_style))
         
-        if user_data.empty or len(user_data) < 3:
+        if aggregates['empty'] or aggregates['rows'] < 3:
             story.append(Paragraph("Insufficient data for performance analysis. Continue studying to see trends!", self.normal_style))
             return story
         
         # Trend analysis
         story.append(Paragraph("Confidence Trends", self.header_style))
         
-        # Calculate trend for each subject
-        trend_analysis = []
-        for subject in user_data['subject'].unique():
-            subject_data = user_data[user_data['subject'] == subject].sort_values('date')
-            if len(subject_data) >= 3:
-                # Simple trend calculation
-                first_third = subject_data.iloc[:len(subject_data)//3]['confidence_rating'].mean()
-                last_third = subject_data.iloc[-len(subject_data)//3:]['confidence_rating'].mean()
-                trend = last_third - first_third
-                
-                trend_analysis.append({
-                    'subject': subject,
-                    'trend': trend,
-                    'current_confidence': last_third
-                })
+        # Trend for each subject with at least 3 sessions
+        trend_analysis = aggregates['trends']
         
         if trend_analysis:
             trends_text = ""
@@ -291,7 +458,7 @@ class PDFExporter:
         # Identify strengths and weaknesses
         story.append(Paragraph("Strengths and Areas for Improvement", self.header_style))
         
-        chapter_performance = user_data.groupby(['subject', 'chapter'])['confidence_rating'].mean()
+        chapter_performance = aggregates['chapter_confidence']
         
         # Top performing chapters
         top_chapters = chapter_performance.nlargest(3)
@@ -318,48 +485,7 @@ class PDFExporter:
         
         story.append(Paragraph("⏏︎ Personalized Recommendations", self.subtitle_style))
         
-        recommendations = []
-        
-        if user_data.empty:
-            recommendations.append("Start logging your study sessions to receive personalized recommendations!")
-        else:
-            # Analyze study patterns and generate recommendations
-            
-            # Check study consistency
-            unique_days = user_data['date'].nunique()
-            date_range = (pd.to_datetime(user_data['date'].max()) - pd.to_datetime(user_data['date'].min())).days + 1
-            consistency_ratio = unique_days / date_range if date_range > 0 else 1
-            
-            if consistency_ratio < 0.5:
-                recommendations.append("⏏︎ Try to study more consistently. Aim for at least 4-5 study sessions per week.")
-            
-            # Check session length
-            avg_session = user_data['duration_minutes'].mean()
-            if avg_session < 20:
-                recommendations.append("⏏︎ Consider longer study sessions (20-45 minutes) for better focus and retention.")
-            elif avg_session > 90:
-                recommendations.append("⏏︎ Break down very long sessions into smaller chunks with breaks for better effectiveness.")
-            
-            # Check confidence levels
-            low_confidence_subjects = user_data.groupby('subject')['confidence_rating'].mean()
-            weak_subjects = low_confidence_subjects[low_confidence_subjects < 3.0]
-            
-            if len(weak_subjects) > 0:
-                subject_list = ", ".join(weak_subjects.index[:3])
-                recommendations.append(f"⏏︎ Focus extra attention on: {subject_list}. Consider seeking additional resources or help.")
-            
-            # Check subject diversity
-            subject_count = user_data['subject'].nunique()
-            if subject_count == 1:
-                recommendations.append("⏏︎ Consider diversifying your study subjects to maintain engagement and prevent burnout.")
-            
-            # Time-based recommendations
-            total_time = user_data['duration_minutes'].sum()
-            if total_time < 300:  # Less than 5 hours total
-                recommendations.append("⚡ Increase your study time gradually. Consistent daily practice leads to better results.")
-            
-            if not recommendations:
-                recommendations.append("⏏︎ Excellent study habits! Keep maintaining your current routine and continue tracking your progress.")
+        recommendations = engine.recommend(user_data, "report")
         
         recommendations_text = ""
         for i, rec in enumerate(recommendations[:6], 1):  # Limit to 6 recommendations
@@ -380,35 +506,10 @@ class PDFExporter:
             story.append(Paragraph("No study sessions recorded.", self.normal_style))
             return story
         
-        # Get recent sessions (last 20)
-        recent_sessions = user_data.tail(20)
-        
-        # Create table data
-        table_data = [['Date', 'Subject', 'Chapter', 'Duration', 'Confidence']]
-        
-        for _, session in recent_sessions.iterrows():
-            table_data.append([
-                str(session['date']),
-                session['subject'],
-                session['chapter'][:25] + '...' if len(session['chapter']) > 25 else session['chapter'],
-                f"{session['duration_minutes']} min",
-                f"{session['confidence_rating']}/5"
-            ])
-        
-        # Create table
-        table = Table(table_data, colWidths=[1*inch, 1.2*inch, 1.8*inch, 0.8*inch, 0.8*inch])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('FONTSIZE', (0, 1), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-        ]))
+        # Get recent sessions (last 20 logged)
+        table = Table([SESSION_COLUMNS] + self._format_session_rows(recent_sessions(user_data, 20)),
+                      colWidths=SESSION_COL_WIDTHS)
+        table.setStyle(self.sessions_table_style)
         
         story.append(table)
         story.append(Spacer(1, 20))
@@ -421,3 +522,38 @@ class PDFExporter:
         story.append(footer)
         
         return story
+    
+    def _format_session_rows(self, sessions):
+        """Format sessions as table rows with vectorized string operations"""
+        if sessions.empty:
+            return []
+        
+        chapter = sessions['chapter'].astype(str)
+        chapter = chapter.where(chapter.str.len() <= 25, chapter.str[:25] + '...')
+        columns = [
+            sessions['date'].astype(str),
+            sessions['subject'].astype(str),
+            chapter,
+            sessions['duration_minutes'].astype(str) + ' min',
+            sessions['confidence_rating'].astype(str) + '/5',
+        ]
+        return np.column_stack([column.to_numpy(dtype=object) for column in columns]).tolist()
+    
+    def _create_history_appendix(self, user_data):
+        """Create an appendix listing every session, split into bounded tables"""
+        story = [PageBreak(), Paragraph("⏏︎ Appendix: Full Session History", self.subtitle_style)]
+        
+        if user_data.empty:
+            story.append(Paragraph("No study sessions recorded.", self.normal_style))
+            return story
+        
+        story.append(Paragraph(f"All {len(user_data):,} sessions in this report period.", self.normal_style))
+        
+        for start in range(0, len(user_data), HISTORY_CHUNK_ROWS):
+            chunk = user_data.iloc[start:start + HISTORY_CHUNK_ROWS]
+            table = LongTable([SESSION_COLUMNS] + self._format_session_rows(chunk),
+                              colWidths=SESSION_COL_WIDTHS, repeatRows=1)
+            table.setStyle(self.sessions_table_style)
+            story.append(table)
+        
+        return story
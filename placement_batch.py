@@ -0,0 +1,142 @@
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from placement_model import FEATURE_COLUMNS, get_registry
+
+# Accepted (min, max) per feature, mirroring the single-candidate form
+FEATURE_BOUNDS = {
+    "CGPA": (0, 10),
+    "Internships": (0, 10),
+    "Projects": (0, 10),
+    "Workshops/Certifications": (0, 20),
+    "AptitudeTestScore": (0, 100),
+    "SoftSkillsRating": (0, 10),
+    "ExtracurricularActivities": (1, 10),
+    "PlacementTraining": (0, 1),
+    "SSC_Marks": (0, 100),
+    "HSC_Marks": (0, 100),
+}
+
+# Columns that may be given as Yes/No instead of 1/0 (ExtracurricularActivities
+# is a 1-10 rating like SoftSkillsRating, not a flag)
+YES_NO_COLUMNS = ["PlacementTraining"]
+
+RESULT_COLUMNS = ["prediction", "placement_probability", "status"]
+
+DEFAULT_CHUNK_SIZE = 50_000
+
+
+def template_csv():
+    """Return an empty CSV with the expected header"""
+    return ",".join(FEATURE_COLUMNS) + "\n"
+
+
+def check_columns(columns):
+    """Raise ValueError if any model feature column is missing"""
+    missing = [c for c in FEATURE_COLUMNS if c not in columns]
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(missing)}")
+
+
+def validate_features(frame):
+    """Convert the feature columns of a frame to a float matrix.
+
+    Returns (features, errors) where features has shape (rows, 10) with NaN
+    rows for invalid candidates, and errors is an object array holding ""
+    for valid rows or a description of the first problem found.
+    """
+    check_columns(frame.columns)
+    n_rows = len(frame)
+    features = np.empty((n_rows, len(FEATURE_COLUMNS)), dtype=float)
+    errors = np.full(n_rows, "", dtype=object)
+
+    for i, column in enumerate(FEATURE_COLUMNS):
+        values = frame[column]
+        if column in YES_NO_COLUMNS and not pd.api.types.is_numeric_dtype(values):
+            mapped = values.astype(str).str.strip().str.lower().map({"yes": 1, "no": 0})
+            values = mapped.where(mapped.notna(), values)
+        numeric = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+
+        low, high = FEATURE_BOUNDS[column]
+        invalid = np.isnan(numeric) | (numeric < low) | (numeric > high)
+        first_problem = invalid & (errors == "")
+        errors[first_problem] = f"{column} must be a number between {low} and {high}"
+        features[:, i] = numeric
+
+    features[errors != ""] = np.nan
+    return features, errors
+
+
+def score_frame(frame, registry=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Score every valid row of a frame, returning it with prediction columns appended"""
+    registry = registry or get_registry()
+    features, errors = validate_features(frame)
+    valid = errors == ""
+
+    predictions = np.full(len(frame), np.nan)
+    probabilities = np.full(len(frame), np.nan)
+    valid_rows = np.flatnonzero(valid)
+    for start in range(0, len(valid_rows), chunk_size):
+        rows = valid_rows[start:start + chunk_size]
+        chunk_predictions, chunk_probabilities = registry.predict(features[rows])
+        predictions[rows] = chunk_predictions
+        probabilities[rows] = chunk_probabilities
+
+    result = frame.copy()
+    result["prediction"] = pd.Series(predictions, index=frame.index).map({1.0: "Placed", 0.0: "Not Placed"})
+    result["placement_probability"] = np.round(probabilities, 4)
+    result["status"] = np.where(valid, "ok", errors)
+    return result
+
+
+def score_csv_stream(source, registry=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Yield scored chunks of a CSV file (path or file-like) without loading it whole"""
+    registry = registry or get_registry()
+    for chunk in pd.read_csv(source, chunksize=chunk_size):
+        yield score_frame(chunk, registry, chunk_size)
+
+
+def _remaining_bytes(handle):
+    """Bytes between the current position of a seekable file and its end"""
+    try:
+        position = handle.tell()
+        end = handle.seek(0, io.SEEK_END)
+        handle.seek(position)
+        return end - position
+    except (AttributeError, OSError, ValueError):
+        return 0
+
+
+def score_csv(source, registry=None, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """Score a CSV and return (csv_bytes, summary) for download.
+
+    progress, if given, is called after each chunk with the fraction (0-1)
+    of the input consumed so far.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb') as handle:
+            return score_csv(handle, registry, chunk_size, progress)
+
+    output = io.StringIO()
+    summary = {"rows": 0, "scored": 0, "invalid": 0, "placed": 0}
+    start = source.tell() if progress else 0
+    total = _remaining_bytes(source) if progress else 0
+
+    for i, scored in enumerate(score_csv_stream(source, registry, chunk_size)):
+        scored.to_csv(output, index=False, header=(i == 0))
+        valid = scored["status"] == "ok"
+        summary["rows"] += len(scored)
+        summary["scored"] += int(valid.sum())
+        summary["invalid"] += int((~valid).sum())
+        summary["placed"] += int((scored["prediction"] == "Placed").sum())
+        if progress and total:
+            # the parser reads ahead, so this is an upper bound until the end
+            progress(min((source.tell() - start) / total, 1.0))
+
+    if summary["rows"] == 0:
+        raise ValueError("The uploaded file has no candidate rows")
+
+    return output.getvalue().encode("utf-8"), summary
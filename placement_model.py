@@ -0,0 +1,286 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+import warnings
+
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MODEL_FILE = "placement_prediction_model.pkl"
+SCALER_FILE = "scaler.pkl"
+MANIFEST_FILE = "placement_model_manifest.json"
+
+# Model input order (matches the scaler's feature_names_in_)
+FEATURE_COLUMNS = [
+    "CGPA", "Internships", "Projects", "Workshops/Certifications",
+    "AptitudeTestScore", "SoftSkillsRating", "ExtracurricularActivities",
+    "PlacementTraining", "SSC_Marks", "HSC_Marks",
+]
+
+
+class ModelIntegrityError(Exception):
+    """Raised when model artifacts do not match the manifest"""
+
+
+class LatencyStats:
+    """Running latency counters (milliseconds)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.last_ms = 0.0
+
+    def record(self, elapsed_ms):
+        with self._lock:
+            self.count += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+            self.last_ms = elapsed_ms
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ms / self.count if self.count else 0.0,
+            'max_ms': self.max_ms,
+            'last_ms': self.last_ms,
+        }
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class SklearnPlacementModel:
+    """Pickled scikit-learn scaler + classifier behind the predictor interface"""
+
+    def __init__(self, model, scaler):
+        self.model = model
+        self.scaler = scaler
+        self.positive_index = list(model.classes_).index(1)
+
+    def predict(self, features):
+        """Scale and score a 2D feature array, returning (predictions, placed probabilities)"""
+        features_scaled = self.scaler.transform(np.asarray(features, dtype=float))
+        predictions = self.model.predict(features_scaled)
+        probabilities = self.model.predict_proba(features_scaled)[:, self.positive_index]
+        return predictions, probabilities
+
+
+class PlacementModelRegistry:
+    """Process-wide holder of the placement predictor.
+
+    Artifacts are loaded lazily on first use, checked against the SHA-256
+    hashes in the manifest, and reloaded when any of the files changes on
+    disk (checked at most every check_interval seconds). A failed reload
+    keeps serving the previously loaded model and records the error.
+
+    engine="auto" uses the exported NumPy model (placement_numpy.py) when
+    placement_model_arrays/ exists and the manifest's numpy_source hashes
+    match the current pickles, which avoids importing scikit-learn; arrays
+    exported from other pickles are skipped with a warning and the pickles
+    are served instead (engine="numpy" refuses them). engine="sklearn"
+    always unpickles the original estimator. With mmap=True the NumPy
+    arrays are memory-mapped so processes share them.
+    """
+
+    def __init__(self, base_dir=BASE_DIR, model_file=MODEL_FILE, scaler_file=SCALER_FILE,
+                 manifest_file=MANIFEST_FILE, numpy_dir=None, engine="auto", mmap=True,
+                 check_interval=2.0):
+        from placement_numpy import NUMPY_MODEL_DIR, array_paths
+
+        self.base_dir = base_dir
+        self.model_path = os.path.join(base_dir, model_file)
+        self.scaler_path = os.path.join(base_dir, scaler_file)
+        self.numpy_dir = os.path.join(base_dir, numpy_dir or NUMPY_MODEL_DIR)
+        self.numpy_paths = array_paths(self.numpy_dir)
+        self.manifest_path = os.path.join(base_dir, manifest_file)
+        self.engine = engine
+        self.mmap = mmap
+        self.check_interval = check_interval
+
+        self._lock = threading.RLock()
+        self._predictor = None  # swapped atomically on reload
+        self._signature = None
+        self._last_check = 0.0
+
+        self.version = None
+        self.active_engine = None
+        self.manifest = {}
+        self.load_warnings = []
+        self.last_error = None
+        self.reloads = 0
+        self.load_latency = LatencyStats()
+        self.predict_latency = LatencyStats()
+
+    def _artifact_paths(self):
+        return [self.model_path, self.scaler_path, *self.numpy_paths, self.manifest_path]
+
+    def _use_numpy(self):
+        if self.engine == "numpy":
+            return True
+        return self.engine == "auto" and all(os.path.exists(path) for path in self.numpy_paths)
+
+    def _file_signature(self):
+        signature = []
+        for path in self._artifact_paths():
+            try:
+                stat = os.stat(path)
+                signature.append((path, stat.st_mtime_ns, stat.st_size))
+            except FileNotFoundError:
+                signature.append((path, None, None))
+        return tuple(signature)
+
+    def _load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {}
+        with open(self.manifest_path, 'r') as f:
+            return json.load(f)
+
+    def _verify(self, manifest, paths):
+        """Check artifact hashes against the manifest and return the combined version"""
+        expected = manifest.get('artifacts', {})
+        combined = hashlib.sha256()
+        for path in paths:
+            actual = _sha256(path)
+            name = os.path.relpath(path, self.base_dir).replace(os.sep, '/')
+            if name in expected and expected[name].get('sha256') != actual:
+                raise ModelIntegrityError(f"{name} does not match the manifest hash")
+            combined.update(actual.encode())
+        return combined.hexdigest()[:12]
+
+    def _stale_numpy_reason(self, manifest):
+        """Why the exported arrays may not come from the current pickles, or None"""
+        directory = os.path.relpath(self.numpy_dir, self.base_dir).replace(os.sep, '/')
+        recorded = manifest.get('numpy_source')
+        if not recorded:
+            return f"{directory}/ has no recorded source pickle hashes; re-export with python placement_numpy.py"
+        for path in (self.model_path, self.scaler_path):
+            name = os.path.relpath(path, self.base_dir).replace(os.sep, '/')
+            # arrays shipped without the pickles have nothing to go stale against
+            if os.path.exists(path) and recorded.get(name) != _sha256(path):
+                return f"{name} changed since {directory}/ was exported; re-export with python placement_numpy.py"
+        return None
+
+    def _load_numpy(self, manifest):
+        from placement_numpy import NumpyPlacementModel
+
+        version = self._verify(manifest, self.numpy_paths)
+        return NumpyPlacementModel.load(self.numpy_dir, mmap=self.mmap), version, []
+
+    def _load_sklearn(self, manifest):
+        version = self._verify(manifest, [self.model_path, self.scaler_path])
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            with open(self.scaler_path, 'rb') as f:
+                scaler = pickle.load(f)
+            with open(self.model_path, 'rb') as f:
+                model = pickle.load(f)
+
+        load_warnings = [str(w.message) for w in caught if w.category is not ResourceWarning]
+        expected_sklearn = manifest.get('sklearn_version')
+        if expected_sklearn:
+            import sklearn
+            if sklearn.__version__ != expected_sklearn:
+                load_warnings.append(
+                    f"Model was trained with scikit-learn {expected_sklearn}, running {sklearn.__version__}"
+                )
+        return SklearnPlacementModel(model, scaler), version, load_warnings
+
+    def _load(self, signature):
+        start = time.perf_counter()
+        manifest = self._load_manifest()
+        use_numpy = self._use_numpy()
+        stale = self._stale_numpy_reason(manifest) if use_numpy else None
+        if stale and self.engine == "numpy":
+            raise ModelIntegrityError(stale)
+        if stale:
+            warnings.warn(f"{stale}; serving the pickled model instead", RuntimeWarning)
+            use_numpy = False
+
+        if use_numpy:
+            predictor, version, load_warnings = self._load_numpy(manifest)
+        else:
+            predictor, version, load_warnings = self._load_sklearn(manifest)
+        if stale:
+            load_warnings.insert(0, f"{stale}; serving the pickled model instead")
+
+        if self._predictor is not None:
+            self.reloads += 1
+        self._predictor = predictor
+        self._signature = signature
+        self.active_engine = "numpy" if use_numpy else "sklearn"
+        self.version = version
+        self.manifest = manifest
+        self.load_warnings = load_warnings
+        self.last_error = None
+        self.load_latency.record((time.perf_counter() - start) * 1000)
+
+    def _ensure_current(self):
+        now = time.monotonic()
+        if self._predictor is not None and now - self._last_check < self.check_interval:
+            return
+        with self._lock:
+            self._last_check = now
+            signature = self._file_signature()
+            if self._predictor is not None and signature == self._signature:
+                return
+            try:
+                self._load(signature)
+            except Exception as e:
+                self.last_error = str(e)
+                if self._predictor is None:
+                    raise
+                # keep serving the previous model, retry when files change again
+                self._signature = signature
+
+    def get(self):
+        """Return the current predictor, loading or reloading it if needed"""
+        self._ensure_current()
+        return self._predictor
+
+    def predict(self, features):
+        """Scale and score a 2D feature array, returning (predictions, placed probabilities)"""
+        predictor = self.get()
+        start = time.perf_counter()
+        predictions, probabilities = predictor.predict(features)
+        self.predict_latency.record((time.perf_counter() - start) * 1000)
+        return predictions, probabilities
+
+    def metrics(self):
+        """Return load/predict latency and status information"""
+        return {
+            'loaded': self._predictor is not None,
+            'engine': self.active_engine,
+            'mmap': self.mmap and self.active_engine == "numpy",
+            'version': self.version,
+            'reloads': self.reloads,
+            'last_error': self.last_error,
+            'load_warnings': list(self.load_warnings),
+            'load_latency': self.load_latency.as_dict(),
+            'predict_latency': self.predict_latency.as_dict(),
+        }
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_registry():
+    """Return the process-wide PlacementModelRegistry shared by all sessions"""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = PlacementModelRegistry()
+    return _registry
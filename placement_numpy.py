@@ -0,0 +1,161 @@
+"""Pure-NumPy inference for the placement model.
+
+The pickled scikit-learn StandardScaler + LogisticRegression pair is
+exported to flat arrays (scaler mean/scale, coefficients, intercept and
+classes), one raw .npy file each in placement_model_arrays/.
+NumpyPlacementModel reproduces scaler.transform -> predict / predict_proba
+with the same floating point operations, so the app can score candidates
+without importing sklearn.
+
+The arrays are opened with np.load(mmap_mode='r'), so every app process
+maps the same page-cache pages instead of holding a private copy.
+
+Re-export after retraining with:
+    python placement_numpy.py
+which also verifies the exported model against the pickles and updates
+the hashes in placement_model_manifest.json, including the hashes of the
+source pickles (numpy_source) that the registry checks before serving
+the arrays.
+"""
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+
+NUMPY_MODEL_DIR = "placement_model_arrays"
+ARRAY_NAMES = ("scaler_mean", "scaler_scale", "coef", "intercept", "classes")
+SUPPORTED_MODELS = ("LogisticRegression",)
+
+
+def array_paths(directory):
+    """Return the .npy file of each exported array, in ARRAY_NAMES order"""
+    return [os.path.join(directory, f"{name}.npy") for name in ARRAY_NAMES]
+
+
+def export_numpy_model(model, scaler, directory):
+    """Write the model and scaler parameters of a binary linear model as .npy files"""
+    model_type = type(model).__name__
+    if model_type not in SUPPORTED_MODELS:
+        raise ValueError(f"Cannot export {model_type}; supported models: {', '.join(SUPPORTED_MODELS)}")
+    if len(model.classes_) != 2:
+        raise ValueError("Only binary classifiers can be exported")
+
+    n_features = model.coef_.shape[1]
+    mean = scaler.mean_ if scaler.with_mean else np.zeros(n_features)
+    scale = scaler.scale_ if scaler.with_std and scaler.scale_ is not None else np.ones(n_features)
+
+    arrays = {
+        'scaler_mean': np.asarray(mean, dtype=np.float64),
+        'scaler_scale': np.asarray(scale, dtype=np.float64),
+        'coef': np.asarray(model.coef_, dtype=np.float64).reshape(-1),
+        'intercept': np.asarray(model.intercept_, dtype=np.float64).reshape(-1),
+        'classes': np.asarray(model.classes_),
+    }
+    os.makedirs(directory, exist_ok=True)
+    for name, path in zip(ARRAY_NAMES, array_paths(directory)):
+        # Running processes may have the old file memory-mapped, so never
+        # truncate it in place: write a sibling and rename it over
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.save(f, arrays[name], allow_pickle=False)
+        os.replace(tmp_path, path)
+
+
+class NumpyPlacementModel:
+    """Scaler + binary logistic regression evaluated with NumPy only"""
+
+    def __init__(self, scaler_mean, scaler_scale, coef, intercept, classes):
+        self.scaler_mean = scaler_mean
+        self.scaler_scale = scaler_scale
+        self.coef = coef
+        self.intercept = intercept
+        self.classes = classes
+        self.positive_index = list(classes).index(1) if 1 in list(classes) else 1
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        """Load the exported arrays, memory-mapped read-only unless mmap=False"""
+        mmap_mode = 'r' if mmap else None
+        return cls(*[np.load(path, mmap_mode=mmap_mode, allow_pickle=False) for path in array_paths(directory)])
+
+    def transform(self, features):
+        """Equivalent of StandardScaler.transform"""
+        scaled = np.array(features, dtype=np.float64, ndmin=2)
+        scaled -= self.scaler_mean
+        scaled /= self.scaler_scale
+        return scaled
+
+    def decision_function(self, features_scaled):
+        return features_scaled @ self.coef + self.intercept[0]
+
+    def predict_proba(self, features_scaled):
+        positive = 1.0 / (1.0 + np.exp(-self.decision_function(features_scaled)))
+        return np.stack([1 - positive, positive], axis=1)
+
+    def predict(self, features):
+        """Scale and score a 2D feature array, returning (predictions, placed probabilities)"""
+        features_scaled = self.transform(features)
+        decision = self.decision_function(features_scaled)
+        predictions = self.classes[(decision > 0).astype(int)]
+        positive = 1.0 / (1.0 + np.exp(-decision))
+        probabilities = positive if self.positive_index == 1 else 1 - positive
+        return predictions, probabilities
+
+
+def verify_numpy_model(model, scaler, numpy_model, n_samples=100_000, seed=0):
+    """Compare NumPy and scikit-learn outputs on random inputs around the training distribution"""
+    rng = np.random.default_rng(seed)
+    mean = numpy_model.scaler_mean
+    scale = numpy_model.scaler_scale
+    features = mean + rng.standard_normal((n_samples, len(mean))) * scale * 3
+
+    expected_predictions = model.predict(scaler.transform(features))
+    expected_probabilities = model.predict_proba(scaler.transform(features))[:, numpy_model.positive_index]
+    predictions, probabilities = numpy_model.predict(features)
+
+    return {
+        'samples': n_samples,
+        'predictions_equal': bool(np.array_equal(predictions, expected_predictions)),
+        'max_probability_diff': float(np.max(np.abs(probabilities - expected_probabilities))),
+    }
+
+
+def main():
+    import pickle
+    from placement_model import BASE_DIR, MANIFEST_FILE, MODEL_FILE, SCALER_FILE
+
+    # hash the exact bytes that are exported, for the manifest's numpy_source
+    source = {}
+    for name in (MODEL_FILE, SCALER_FILE):
+        with open(os.path.join(BASE_DIR, name), 'rb') as f:
+            source[name] = f.read()
+    model = pickle.loads(source[MODEL_FILE])
+    scaler = pickle.loads(source[SCALER_FILE])
+
+    directory = os.path.join(BASE_DIR, NUMPY_MODEL_DIR)
+    export_numpy_model(model, scaler, directory)
+    report = verify_numpy_model(model, scaler, NumpyPlacementModel.load(directory))
+    print(f"Exported {directory}: {report}")
+    if not report['predictions_equal'] or report['max_probability_diff'] > 1e-12:
+        print("Verification failed; manifest not updated")
+        return 1
+
+    manifest_path = os.path.join(BASE_DIR, MANIFEST_FILE)
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    artifacts = manifest.setdefault('artifacts', {})
+    for path in array_paths(directory):
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        artifacts[os.path.relpath(path, BASE_DIR).replace(os.sep, '/')] = {'sha256': digest}
+    manifest['numpy_source'] = {name: hashlib.sha256(data).hexdigest() for name, data in source.items()}
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+import numpy as np
+
+from placement_batch import FEATURE_BOUNDS
+from placement_model import FEATURE_COLUMNS, get_registry
+from profiling import stage
+
+# Grid resolution per feature; counts and scores step by whole units
+SWEEP_STEPS = {
+    "CGPA": 0.1,
+    "Internships": 1,
+    "Projects": 1,
+    "Workshops/Certifications": 1,
+    "AptitudeTestScore": 1,
+    "SoftSkillsRating": 1,
+    "ExtracurricularActivities": 1,
+    "PlacementTraining": 1,
+    "SSC_Marks": 0.5,
+    "HSC_Marks": 0.5,
+}
+
+DEFAULT_MAX_POINTS = 201
+
+
+def feature_values(feature, max_points=DEFAULT_MAX_POINTS):
+    """Return the values a feature is swept over, at most max_points of them"""
+    low, high = FEATURE_BOUNDS[feature]
+    step = SWEEP_STEPS[feature]
+    values = np.arange(low, high + step / 2, step, dtype=float)
+    if len(values) > max_points:
+        values = np.linspace(low, high, max_points)
+    return values
+
+
+def sensitivity_sweep(base_row, x_feature, y_feature=None, registry=None, max_points=DEFAULT_MAX_POINTS):
+    """Score a grid over one or two features with everything else held at base_row.
+
+    The whole grid plus base_row itself (as the last row) is scored with a
+    single registry.predict call. Returns a dict with the swept values ('x',
+    and 'y' for two features) and 'probability' / 'prediction' arrays shaped
+    (len(x),) or (len(y), len(x)).
+    """
+    registry = registry or get_registry()
+    base_row = np.asarray(base_row, dtype=float).reshape(-1)
+    x_index = FEATURE_COLUMNS.index(x_feature)
+    x_values = feature_values(x_feature, max_points)
+
+    if y_feature is None or y_feature == x_feature:
+        y_feature, y_values = None, None
+        shape = (len(x_values),)
+        grid = np.repeat(base_row[np.newaxis, :], len(x_values), axis=0)
+        grid[:, x_index] = x_values
+    else:
+        y_index = FEATURE_COLUMNS.index(y_feature)
+        y_values = feature_values(y_feature, max_points)
+        xx, yy = np.meshgrid(x_values, y_values)
+        shape = xx.shape
+        grid = np.repeat(base_row[np.newaxis, :], xx.size, axis=0)
+        grid[:, x_index] = xx.ravel()
+        grid[:, y_index] = yy.ravel()
+
+    rows = np.vstack([grid, base_row])
+    with stage("placement.sensitivity", rows=len(rows)):
+        predictions, probabilities = registry.predict(rows)
+    predictions = np.asarray(predictions)
+
+    return {
+        'x_feature': x_feature,
+        'y_feature': y_feature,
+        'x': x_values,
+        'y': y_values,
+        'base_row': base_row,
+        'base_prediction': int(predictions[-1]),
+        'base_probability': float(probabilities[-1]),
+        'probability': probabilities[:-1].reshape(shape),
+        'prediction': predictions[:-1].reshape(shape),
+        'evaluations': len(rows),
+    }
+
+
+def nearest_flip(sweep):
+    """Find the grid point closest to the input whose prediction differs.
+
+    Distances are measured in units of each feature's range so the two axes
+    are comparable. Returns a dict of feature -> value, or None if no point
+    on the grid changes the outcome.
+    """
+    flipped = sweep['prediction'] != sweep['base_prediction']
+    if not flipped.any():
+        return None
+
+    features = [sweep['x_feature']]
+    if sweep['y_feature'] is None:
+        coords = [sweep['x']]
+    else:
+        features.append(sweep['y_feature'])
+        coords = list(np.meshgrid(sweep['x'], sweep['y']))
+
+    distance = np.zeros(flipped.shape)
+    for feature, values in zip(features, coords):
+        low, high = FEATURE_BOUNDS[feature]
+        base_value = sweep['base_row'][FEATURE_COLUMNS.index(feature)]
+        distance += ((values - base_value) / (high - low)) ** 2
+    distance[~flipped] = np.inf
+
+    best = np.unravel_index(np.argmin(distance), flipped.shape)
+    return {feature: float(values[best]) for feature, values in zip(features, coords)}
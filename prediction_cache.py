@@ -0,0 +1,122 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from placement_model import FEATURE_COLUMNS, get_registry
+
+# The form only produces integers and 0.1 steps, so one decimal is lossless
+QUANTIZE_DECIMALS = 1
+
+
+def quantize(features):
+    """Round a single feature row to the form's resolution and return it as a tuple key"""
+    row = np.round(np.asarray(features, dtype=float).reshape(-1), QUANTIZE_DECIMALS)
+    if row.shape[0] != len(FEATURE_COLUMNS):
+        raise ValueError(f"Expected {len(FEATURE_COLUMNS)} features, got {row.shape[0]}")
+    return tuple(row.tolist())
+
+
+class PredictionCache:
+    """Bounded LRU of predictions per quantized input.
+
+    Keys include the registry's model version, so a hot-reloaded model
+    never serves stale entries (old ones simply age out).
+    """
+
+    def __init__(self, registry=None, max_entries=10_000):
+        self.registry = registry or get_registry()
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _key(self, features):
+        # get() first so the version reflects any pending hot reload
+        self.registry.get()
+        return (self.registry.version, quantize(features))
+
+    def lookup(self, features, key=None):
+        """Return the cached entry for this input (or None), counting hit/miss"""
+        if key is None:
+            key = self._key(features)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def store(self, features, prediction, probability, key=None):
+        """Insert a prediction.
+
+        Pass the key taken before scoring, so a model reloaded in between
+        cannot file an old model's result under the new version.
+        """
+        if key is None:
+            key = self._key(features)
+        entry = {
+            'features': key[1],
+            'prediction': int(prediction),
+            'probability': float(probability),
+        }
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return entry
+
+    def predict(self, features, predict_fn=None):
+        """Return (prediction, probability), scoring only on a cache miss.
+
+        predict_fn receives the quantized row and returns (prediction,
+        probability); it defaults to a direct registry call.
+        """
+        key = self._key(features)
+        entry = self.lookup(features, key)
+        if entry is None:
+            row = np.array(key[1])
+            if predict_fn is None:
+                predictions, probabilities = self.registry.predict(row.reshape(1, -1))
+                prediction, probability = predictions[0], probabilities[0]
+            else:
+                prediction, probability = predict_fn(row)
+            entry = self.store(row, prediction, probability, key)
+        return entry['prediction'], entry['probability']
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_prediction_cache():
+    """Return the process-wide PredictionCache shared by all sessions"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PredictionCache()
+    return _cache
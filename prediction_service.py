@@ -0,0 +1,142 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+import numpy as np
+
+from placement_model import FEATURE_COLUMNS, get_registry
+
+
+class MicroBatchPredictor:
+    """In-process placement prediction service with request coalescing.
+
+    Callers submit single feature rows; a background worker takes every
+    request already queued, waits up to max_wait_ms after the first one for
+    others to arrive, scores up to max_batch_size rows with one
+    registry.predict call and resolves each caller's Future with its own
+    (prediction, probability).
+
+    max_wait_ms=None picks the window from the active engine: the NumPy
+    predictor is cheap enough per call that waiting only adds latency, so
+    it just drains the queue; the scikit-learn engine waits 5 ms.
+    """
+
+    def __init__(self, registry=None, max_batch_size=256, max_wait_ms=None):
+        self.registry = registry or get_registry()
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.requests = 0
+        self.batches = 0
+        self.max_observed_batch = 0
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run, name="placement-microbatch", daemon=True)
+                    self._worker.start()
+
+    def submit(self, features):
+        """Queue one candidate's feature row and return a Future"""
+        if self._closed:
+            raise RuntimeError("Prediction service is closed")
+        row = np.asarray(features, dtype=float).reshape(-1)
+        if row.shape[0] != len(FEATURE_COLUMNS):
+            raise ValueError(f"Expected {len(FEATURE_COLUMNS)} features, got {row.shape[0]}")
+
+        future = Future()
+        self._ensure_worker()
+        self._queue.put((row, future))
+        return future
+
+    def predict(self, features, timeout=10.0):
+        """Blocking helper returning (prediction, placed probability) for one row"""
+        return self.submit(features).result(timeout=timeout)
+
+    def _wait_ms(self):
+        if self.max_wait_ms is not None:
+            return self.max_wait_ms
+        return 0.0 if self.registry.active_engine == "numpy" else 5.0
+
+    def _collect_batch(self):
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = time.perf_counter() + self._wait_ms() / 1000
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                if remaining > 0:
+                    item = self._queue.get(timeout=remaining)
+                else:
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                # re-queue the shutdown marker after finishing this batch
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            if batch is None:
+                return
+
+            rows = np.vstack([row for row, _ in batch])
+            futures = [future for _, future in batch]
+            try:
+                predictions, probabilities = self.registry.predict(rows)
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                continue
+
+            for future, prediction, probability in zip(futures, predictions, probabilities):
+                future.set_result((int(prediction), float(probability)))
+
+            with self._lock:
+                self.requests += len(batch)
+                self.batches += 1
+                self.max_observed_batch = max(self.max_observed_batch, len(batch))
+
+    def close(self):
+        """Stop the worker after already queued requests are served"""
+        self._closed = True
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(None)
+            self._worker.join()
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'batches': self.batches,
+                'mean_batch_size': self.requests / self.batches if self.batches else 0.0,
+                'max_batch_size': self.max_observed_batch,
+                'queued': self._queue.qsize(),
+            }
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_service():
+    """Return the process-wide MicroBatchPredictor shared by all sessions"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = MicroBatchPredictor()
+    return _service
@@ -0,0 +1,114 @@
+import os
+import functools
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+
+class StageProfiler:
+    """Opt-in, process-wide collector of per-stage wall/CPU timings.
+
+    Disabled by default; enable with ELEVATE_PROFILE=1 or profiler.enable().
+    While disabled, stage() only yields a throwaway dict, so instrumented
+    code can always set record['rows'] without checking.
+    """
+
+    def __init__(self, enabled=None, max_records=5000):
+        if enabled is None:
+            enabled = os.environ.get("ELEVATE_PROFILE", "").lower() not in ("", "0", "false")
+        self.enabled = enabled
+        self._records = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        """Drop all collected records"""
+        with self._lock:
+            self._records.clear()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """Time a block; the yielded dict can be updated with 'rows' or extra fields"""
+        if not self.enabled:
+            yield {}
+            return
+
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        record = {
+            'stage': name,
+            'parent': stack[-1] if stack else None,
+            'depth': len(stack),
+            'rows': rows,
+            'thread': threading.current_thread().name,
+        }
+        stack.append(name)
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        try:
+            yield record
+        finally:
+            record['wall_ms'] = (time.perf_counter() - wall_start) * 1000
+            record['cpu_ms'] = (time.thread_time() - cpu_start) * 1000
+            record['finished_at'] = time.time()
+            stack.pop()
+            with self._lock:
+                self._records.append(record)
+
+    def records(self):
+        """Return a copy of the collected stage records (oldest first)"""
+        with self._lock:
+            return [dict(r) for r in self._records]
+
+    def summary(self):
+        """Aggregate records per stage, slowest total wall time first"""
+        stats = {}
+        for record in self.records():
+            entry = stats.setdefault(record['stage'], {
+                'stage': record['stage'],
+                'calls': 0,
+                'total_wall_ms': 0.0,
+                'total_cpu_ms': 0.0,
+                'max_wall_ms': 0.0,
+                'total_rows': 0,
+            })
+            entry['calls'] += 1
+            entry['total_wall_ms'] += record['wall_ms']
+            entry['total_cpu_ms'] += record['cpu_ms']
+            entry['max_wall_ms'] = max(entry['max_wall_ms'], record['wall_ms'])
+            if record.get('rows') is not None:
+                entry['total_rows'] += int(record['rows'])
+
+        for entry in stats.values():
+            entry['mean_wall_ms'] = entry['total_wall_ms'] / entry['calls']
+
+        return sorted(stats.values(), key=lambda e: e['total_wall_ms'], reverse=True)
+
+
+profiler = StageProfiler()
+
+
+def stage(name, rows=None):
+    """Shortcut for profiler.stage() on the process-wide profiler"""
+    return profiler.stage(name, rows)
+
+
+def profiled(name):
+    """Decorator form of stage() for functions whose first argument is a DataFrame"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            rows = len(args[0]) if args and hasattr(args[0], '__len__') else None
+            with profiler.stage(name, rows):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,333 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from profiling import stage
+from utils import calculate_streak, data_fingerprint
+
+AUDIENCES = ("ui", "analysis", "report")
+
+
+def compute_features(user_data):
+    """Compute every aggregate the recommendation rules need in one pass.
+
+    Dates are parsed once and rows are aggregated once at topic level;
+    subject-level figures are rolled up from the (small) topic table.
+    """
+    features = {'empty': user_data.empty}
+    if user_data.empty:
+        return features
+
+    dates = pd.to_datetime(user_data['date']).dt.normalize().to_numpy()
+    durations = user_data['duration_minutes'].to_numpy(dtype=float)
+    confidence = user_data['confidence_rating'].to_numpy(dtype=float)
+    today = np.datetime64(datetime.now().date(), 'ns')
+    day = np.timedelta64(1, 'D')
+
+    features['total_sessions'] = len(user_data)
+    features['total_time'] = durations.sum()
+    features['avg_session_length'] = durations.mean()
+    features['avg_confidence'] = confidence.mean()
+
+    # confidence trend: first vs last 5 sessions in date order
+    if len(user_data) >= 10:
+        ordered = confidence[np.argsort(dates, kind='stable')]
+        features['confidence_improvement'] = ordered[-5:].mean() - ordered[:5].mean()
+    else:
+        features['confidence_improvement'] = 0
+
+    # activity relative to today
+    features['current_streak'] = calculate_streak(user_data)
+
+    in_30d = (dates >= today - 30 * day) & (dates <= today)
+    if in_30d.any():
+        study_days_30d = len(np.unique(dates[in_30d]))
+        possible_days = min(30, int((today - dates[in_30d].min()) / day) + 1)
+        features['consistency_30d'] = min(100, study_days_30d / possible_days * 100) if possible_days else 0
+    else:
+        features['consistency_30d'] = 0
+
+    in_7d = (dates >= today - 7 * day) & (dates <= today)
+    features['recent_sessions'] = int(in_7d.sum())
+    features['recent_study_time'] = durations[in_7d].sum()
+
+    # activity relative to the last logged session
+    last_date = dates.max()
+    first_date = dates.min()
+    features['unique_days'] = len(np.unique(dates))
+    features['date_span_days'] = int((last_date - first_date) / day) + 1
+    features['sessions_last_week_of_data'] = int((dates >= last_date - 7 * day).sum())
+
+    # one pass over the rows at topic level, subjects rolled up from topics
+    topic_stats = pd.DataFrame({
+        'subject': user_data['subject'].to_numpy(),
+        'chapter': user_data['chapter'].to_numpy(),
+        'confidence': confidence,
+        'duration': durations,
+    }).groupby(['subject', 'chapter'], sort=True).agg(
+        confidence_sum=('confidence', 'sum'),
+        session_count=('confidence', 'count'),
+        total_time=('duration', 'sum'),
+    )
+    topic_stats['avg_confidence'] = topic_stats['confidence_sum'] / topic_stats['session_count']
+
+    subject_stats = topic_stats.groupby(level='subject', sort=True)[
+        ['confidence_sum', 'session_count', 'total_time']
+    ].sum()
+    subject_stats['avg_confidence'] = subject_stats['confidence_sum'] / subject_stats['session_count']
+
+    features['topic_stats'] = topic_stats.reset_index()
+    features['subject_stats'] = subject_stats.reset_index()
+    features['subjects_studied'] = len(subject_stats)
+
+    return features
+
+
+class RecommendationEngine:
+    """Rule-based recommendations shared by the UI, MLAnalyzer and PDFExporter.
+
+    Features are computed once per data version and the "ui" and "report"
+    rules are evaluated once per data version; both are kept in a small LRU
+    cache, so e.g. building a PDF right after the analysis page reuses the
+    features.
+    """
+
+    def __init__(self, max_entries=32):
+        self.max_entries = max_entries
+        self._features = OrderedDict()
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        self.limits = {"ui": 5, "analysis": 6, "report": 6}
+        self.weak_confidence_threshold = 3.0
+        self.weak_topic_min_sessions = 2
+
+    def _cache_get(self, cache, key):
+        with self._lock:
+            if key in cache:
+                cache.move_to_end(key)
+                self.hits += 1
+                return cache[key]
+            self.misses += 1
+            return None
+
+    def _cache_put(self, cache, key, value):
+        with self._lock:
+            cache[key] = value
+            cache.move_to_end(key)
+            while len(cache) > self.max_entries:
+                cache.popitem(last=False)
+
+    def _version(self, user_data):
+        # rules depend on "today" (streaks, recent activity) as well as the data
+        return (data_fingerprint(user_data), datetime.now().date().isoformat())
+
+    def get_features(self, user_data, version=None):
+        """Return the cached feature set for this data version"""
+        version = version or self._version(user_data)
+        features = self._cache_get(self._features, version)
+        if features is None:
+            with stage("recommendations.features", rows=len(user_data)):
+                features = compute_features(user_data)
+            self._cache_put(self._features, version, features)
+        return features
+
+    def recommend(self, user_data, audience="ui", weak_topics=None, insights=None):
+        """Return the recommendation list for one consumer.
+
+        weak_topics and insights are the MLAnalyzer outputs used by the
+        "analysis" audience. They are caller inputs rather than part of the
+        data version, so that audience reuses the cached features but its
+        rules run on every call.
+        """
+        if audience not in AUDIENCES:
+            raise ValueError(f"Unknown recommendation audience: {audience}")
+
+        version = self._version(user_data)
+        key = version + (audience,)
+        cacheable = audience != "analysis"
+        cached = self._cache_get(self._results, key) if cacheable else None
+        if cached is not None:
+            return list(cached)
+
+        features = self.get_features(user_data, version)
+        with stage(f"recommendations.rules.{audience}", rows=len(user_data)):
+            if audience == "ui":
+                recommendations = self._ui_rules(features)
+            elif audience == "analysis":
+                recommendations = self._analysis_rules(features, weak_topics or [], insights or {})
+            else:
+                recommendations = self._report_rules(features)
+
+        recommendations = recommendations[:self.limits[audience]]
+        if cacheable:
+            self._cache_put(self._results, key, recommendations)
+        return list(recommendations)
+
+    def clear(self):
+        with self._lock:
+            self._features.clear()
+            self._results.clear()
+
+    def _weak_topics(self, features):
+        topic_stats = features['topic_stats']
+        avg_confidence = topic_stats['avg_confidence'].round(2)
+        weak = topic_stats[
+            (avg_confidence < self.weak_confidence_threshold) &
+            (topic_stats['session_count'] >= self.weak_topic_min_sessions)
+        ]
+        return weak.loc[avg_confidence[weak.index].sort_values(kind='stable').index]
+
+    def _ui_rules(self, features):
+        """Dashboard/utils recommendations (formerly utils.get_study_recommendations)"""
+        if features['empty']:
+            return ["Start logging your study sessions to get personalized recommendations!"]
+
+        recommendations = []
+
+        # Session length recommendations
+        if features['avg_session_length'] < 15:
+            recommendations.append("Try longer study sessions (20-45 minutes) for better focus and retention.")
+        elif features['avg_session_length'] > 90:
+            recommendations.append("Consider breaking long sessions into smaller chunks with breaks.")
+
+        # Consistency recommendations
+        if features['current_streak'] == 0:
+            recommendations.append("Start building a study streak! Consistent daily practice is key to success.")
+        elif features['consistency_30d'] < 50:
+            recommendations.append("Try to study more regularly. Aim for at least 4-5 sessions per week.")
+
+        # Confidence recommendations
+        if features['avg_confidence'] < 3.0:
+            recommendations.append("Focus on building confidence. Review fundamentals and practice more problems.")
+        elif features['confidence_improvement'] < -0.3:
+            recommendations.append("Your confidence seems to be declining. Consider reviewing recent topics or seeking help.")
+
+        # Subject diversity
+        if features['subjects_studied'] == 1:
+            recommendations.append("Consider studying multiple subjects to maintain engagement and prevent burnout.")
+        elif features['subjects_studied'] > 5:
+            recommendations.append("You're studying many subjects. Ensure you're giving adequate time to each.")
+
+        # Recent activity
+        if features['recent_sessions'] == 0:
+            recommendations.append("You haven't studied recently. Get back on track with a short session today!")
+        elif features['recent_study_time'] < 60:  # Less than 1 hour in last week
+            recommendations.append("Increase your weekly study time for better progress.")
+
+        # Weak topics
+        weak_topics = self._weak_topics(features).head(2)
+        if not weak_topics.empty:
+            subjects = [f"{row.subject} - {row.chapter}" for row in weak_topics.itertuples()]
+            recommendations.append(f"Give extra attention to: {', '.join(subjects)}")
+
+        if not recommendations:
+            recommendations.append("Excellent study habits! Keep up the great work!")
+
+        return recommendations
+
+    def _analysis_rules(self, features, weak_topics, insights):
+        """Weakness Analysis recommendations (formerly MLAnalyzer._generate_recommendations)"""
+        recommendations = []
+
+        # weakness-based recommendations
+        if weak_topics:
+            top_weak = weak_topics[:3]
+            topic_list = ', '.join([f"{t['subject']} - {t['chapter']}" for t in top_weak])
+            recommendations.append(f"Focus on these weak areas: {topic_list}")
+
+            for topic in top_weak:
+                if topic['improvement_trend'] < 0:
+                    recommendations.append(f" {topic['subject']} - {topic['chapter']}: Try different study methods, confidence is declining")
+                elif topic['sessions'] < 5:
+                    recommendations.append(f" {topic['subject']} - {topic['chapter']}: Needs more practice sessions")
+
+        # pattern-based recommendations
+        if 'study_patterns' in insights and insights['study_patterns'].get('status') != 'pattern_analysis_failed':
+            patterns = insights['study_patterns']
+
+            if 'most_productive_day' in patterns:
+                recommendations.append(f"You perform best on {patterns['most_productive_day']}s - consider scheduling important topics then")
+
+            if 'avg_session_length' in patterns:
+                avg_length = patterns['avg_session_length']
+                if avg_length < 20:
+                    recommendations.append("Consider longer study sessions (20-45 minutes) for better retention")
+                elif avg_length > 90:
+                    recommendations.append("Break down long sessions into smaller chunks with breaks")
+
+        # performance trend recommendations
+        if 'performance_prediction' in insights and insights['performance_prediction'].get('status') == 'success':
+            pred = insights['performance_prediction']
+
+            if pred['confidence_trend'] < -0.2:
+                recommendations.append("Your confidence has been declining recently - consider reviewing fundamentals")
+            elif pred['confidence_trend'] > 0.2:
+                recommendations.append("Great progress! Your confidence is improving - keep up the momentum")
+
+            if pred['time_trend'] < -10:
+                recommendations.append("You've been studying less lately - try to maintain consistency")
+
+        if features['empty']:
+            return recommendations or ["Great job! No major issues detected. Keep maintaining your study routine!"]
+
+        # General Recommendations
+        if features['total_sessions'] >= 10 and features['sessions_last_week_of_data'] < 3:
+            recommendations.append("Try to study more consistently - aim for at least 3 sessions per week")
+
+        # subject diversity recommendations
+        if features['subjects_studied'] == 1:
+            recommendations.append("Consider diversifying your subjects to maintain engagement")
+        elif features['subjects_studied'] > 5:
+            recommendations.append("You're studying many subjects - ensure you're giving enough attention to each")
+
+        if not recommendations:
+            recommendations.append("Great job! No major issues detected. Keep maintaining your study routine!")
+
+        return recommendations
+
+    def _report_rules(self, features):
+        """PDF report recommendations (formerly PDFExporter._create_recommendations)"""
+        if features['empty']:
+            return ["Start logging your study sessions to receive personalized recommendations!"]
+
+        recommendations = []
+
+        # Check study consistency
+        consistency_ratio = features['unique_days'] / features['date_span_days'] if features['date_span_days'] > 0 else 1
+        if consistency_ratio < 0.5:
+            recommendations.append("⏏︎ Try to study more consistently. Aim for at least 4-5 study sessions per week.")
+
+        # Check session length
+        if features['avg_session_length'] < 20:
+            recommendations.append("⏏︎ Consider longer study sessions (20-45 minutes) for better focus and retention.")
+        elif features['avg_session_length'] > 90:
+            recommendations.append("⏏︎ Break down very long sessions into smaller chunks with breaks for better effectiveness.")
+
+        # Check confidence levels
+        subject_stats = features['subject_stats']
+        weak_subjects = subject_stats[subject_stats['avg_confidence'] < 3.0]['subject']
+        if len(weak_subjects) > 0:
+            subject_list = ", ".join(map(str, weak_subjects[:3]))
+            recommendations.append(f"⏏︎ Focus extra attention on: {subject_list}. Consider seeking additional resources or help.")
+
+        # Check subject diversity
+        if features['subjects_studied'] == 1:
+            recommendations.append("⏏︎ Consider diversifying your study subjects to maintain engagement and prevent burnout.")
+
+        # Time-based recommendations
+        if features['total_time'] < 300:  # Less than 5 hours total
+            recommendations.append("⚡ Increase your study time gradually. Consistent daily practice leads to better results.")
+
+        if not recommendations:
+            recommendations.append("⏏︎ Excellent study habits! Keep maintaining your current routine and continue tracking your progress.")
+
+        return recommendations
+
+
+engine = RecommendationEngine()
@@ -0,0 +1,179 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from datetime import date
+
+from utils import data_fingerprint
+
+# Bump whenever the PDF layout or content changes so old reports are not served
+REPORT_VERSION = "3"
+
+DEFAULT_CACHE_DIR = os.path.join("data", "report_cache")
+
+
+class ReportCache:
+    """Two-level (memory + disk) LRU cache of generated PDF reports.
+
+    Keys combine the username, period, a fingerprint of the report data,
+    REPORT_VERSION and today's date (the report embeds the generation date
+    and streak-based recommendations). Both levels are bounded by total
+    bytes: memory evicts least recently used entries, disk evicts the files
+    with the oldest access time.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, max_memory_bytes=32 * 1024 * 1024,
+                 max_disk_bytes=256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def key(self, username, period, user_data, quiz_data=None, **options):
+        """Return the cache key for one report request"""
+        parts = [
+            REPORT_VERSION, username, period, date.today().isoformat(),
+            data_fingerprint(user_data),
+            data_fingerprint(quiz_data) if quiz_data is not None else "none",
+        ]
+        parts.extend(f"{name}={options[name]}" for name in sorted(options))
+        return hashlib.sha1("\x1f".join(parts).encode()).hexdigest()
+
+    def _path(self, username, key):
+        # username prefix lets a user's reports be removed without an index
+        return os.path.join(self.cache_dir, f"{username}_{key}.pdf")
+
+    def _remember(self, key, pdf_bytes):
+        with self._lock:
+            if key in self._memory:
+                self._memory_bytes -= len(self._memory.pop(key))
+            if len(pdf_bytes) > self.max_memory_bytes:
+                return
+            self._memory[key] = pdf_bytes
+            self._memory_bytes += len(pdf_bytes)
+            while self._memory_bytes > self.max_memory_bytes:
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    def get(self, username, key):
+        """Return cached PDF bytes or None"""
+        with self._lock:
+            pdf_bytes = self._memory.get(key)
+            if pdf_bytes is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return pdf_bytes
+
+        path = self._path(username, key)
+        try:
+            with open(path, 'rb') as f:
+                pdf_bytes = f.read()
+            os.utime(path)  # mark as recently used for disk eviction
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        with self._lock:
+            self.disk_hits += 1
+        self._remember(key, pdf_bytes)
+        return pdf_bytes
+
+    def put(self, username, key, pdf_bytes):
+        """Store PDF bytes in memory and on disk"""
+        self._remember(key, pdf_bytes)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path(username, key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(pdf_bytes)
+            os.replace(tmp_path, path)
+            self._evict_disk()
+        except OSError:
+            # the disk level is best effort; memory still serves repeats
+            pass
+
+    def _disk_entries(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".pdf"):
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict_disk(self):
+        entries = sorted(self._disk_entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def get_or_generate(self, username, user_data, period, generate, quiz_data=None, **options):
+        """Return (pdf_bytes, cached), calling generate() only on a miss"""
+        key = self.key(username, period, user_data, quiz_data, **options)
+        pdf_bytes = self.get(username, key)
+        if pdf_bytes is not None:
+            return pdf_bytes, True
+
+        pdf_bytes = generate()
+        self.put(username, key, pdf_bytes)
+        return pdf_bytes, False
+
+    def invalidate_user(self, username):
+        """Drop every cached report of a user (e.g. after their data is deleted)"""
+        if not os.path.isdir(self.cache_dir):
+            return
+        prefix = f"{username}_"
+        for name in os.listdir(self.cache_dir):
+            key = name[len(prefix):-len(".pdf")]
+            if name.startswith(prefix) and name.endswith(".pdf") and len(key) == 40 and "_" not in key:
+                with self._lock:
+                    if key in self._memory:
+                        self._memory_bytes -= len(self._memory.pop(key))
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except FileNotFoundError:
+                    pass
+
+    def metrics(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                'memory_entries': len(self._memory),
+                'memory_bytes': self._memory_bytes,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_report_cache():
+    """Return the process-wide ReportCache shared by all sessions"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ReportCache()
+    return _cache
@@ -0,0 +1,138 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from report_cache import get_report_cache
+
+JOB_STATUSES = ("queued", "running", "done", "failed")
+
+
+class ReportJobQueue:
+    """Background PDF report generation with job IDs and per-section progress.
+
+    Jobs run on a small thread pool so the Streamlit script thread returns
+    immediately; the page polls job(job_id) for progress. Requests with the
+    same report cache key (user, period, data version, options) that are
+    still queued or running share one job instead of rendering twice, and
+    finished reports land in the report cache so later requests are instant.
+    Only the most recent max_jobs finished jobs are retained.
+    """
+
+    def __init__(self, max_workers=2, max_jobs=64, cache=None):
+        self.max_jobs = max_jobs
+        self.cache = cache or get_report_cache()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="pdf-report")
+        self._jobs = OrderedDict()
+        self._in_flight = {}  # cache key -> job id
+        self._lock = threading.Lock()
+
+        self.submitted = 0
+        self.deduplicated = 0
+
+    def submit(self, username, user_data, period, **options):
+        """Queue a report and return its job id (an existing one for duplicate requests)"""
+        key = self.cache.key(username, period, user_data, **options)
+        with self._lock:
+            self.submitted += 1
+            job_id = self._in_flight.get(key)
+            if job_id is not None:
+                self.deduplicated += 1
+                return job_id
+
+            job_id = uuid.uuid4().hex[:12]
+            self._jobs[job_id] = {
+                'id': job_id,
+                'username': username,
+                'period': period,
+                'status': "queued",
+                'section': None,
+                'progress': 0.0,
+                'error': None,
+                'result': None,
+                'cached': False,
+                'submitted_at': time.time(),
+                'finished_at': None,
+            }
+            self._in_flight[key] = job_id
+
+        # already rendered: finish right away without touching the pool
+        pdf_bytes = self.cache.get(username, key)
+        if pdf_bytes is not None:
+            self._finish(job_id, key, status="done", progress=1.0, section="done", result=pdf_bytes,
+                         cached=True, finished_at=time.time())
+            return job_id
+
+        self._executor.submit(self._run, job_id, key, username, user_data, period, options)
+        return job_id
+
+    def _update(self, job_id, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _finish(self, job_id, key, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+            self._in_flight.pop(key, None)
+            self._prune()
+
+    def _run(self, job_id, key, username, user_data, period, options):
+        from pdf_exporter import PDFExporter
+
+        self._update(job_id, status="running")
+        try:
+            pdf_bytes = PDFExporter().generate_report(
+                username, user_data, period,
+                progress=lambda section, done: self._update(job_id, section=section, progress=done),
+                **options
+            )
+            self.cache.put(username, key, pdf_bytes)
+        except Exception as e:
+            self._finish(job_id, key, status="failed", error=str(e), finished_at=time.time())
+        else:
+            self._finish(job_id, key, status="done", progress=1.0, section="done", result=pdf_bytes,
+                         finished_at=time.time())
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job['status'] in ("done", "failed")]
+        for job_id in finished[:max(0, len(finished) - self.max_jobs)]:
+            del self._jobs[job_id]
+
+    def job(self, job_id):
+        """Return a snapshot of a job (without the PDF bytes), or None if unknown"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            return {name: value for name, value in job.items() if name != 'result'}
+
+    def result(self, job_id):
+        """Return the PDF bytes of a finished job, or None"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return job['result'] if job is not None else None
+
+    def metrics(self):
+        with self._lock:
+            statuses = [job['status'] for job in self._jobs.values()]
+            return {
+                'submitted': self.submitted,
+                'deduplicated': self.deduplicated,
+                'in_flight': len(self._in_flight),
+                **{status: statuses.count(status) for status in JOB_STATUSES},
+            }
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_report_jobs():
+    """Return the process-wide ReportJobQueue shared by all sessions"""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = ReportJobQueue()
+    return _queue
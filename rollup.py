@@ -0,0 +1,114 @@
+import os
+from datetime import date, timedelta
+
+import pandas as pd
+
+from utils import slice_period
+
+ROLLUP_COLUMNS = ['date', 'subject', 'duration_minutes', 'sessions', 'confidence_sum']
+
+
+def empty_rollup():
+    return pd.DataFrame({
+        'date': pd.Series(dtype='datetime64[ns]'),
+        'subject': pd.Series(dtype=object),
+        'duration_minutes': pd.Series(dtype='int64'),
+        'sessions': pd.Series(dtype='int64'),
+        'confidence_sum': pd.Series(dtype='int64'),
+    })
+
+
+def build_rollup(user_data):
+    """Aggregate raw sessions into the day x subject rollup cube.
+
+    One row per (date, subject) with summed minutes, the session count and
+    the summed confidence rating, sorted by date (datetime64) then subject,
+    so utils.slice_period applies to it as to the sessions. Averages are
+    derived as confidence_sum / sessions, so the cube can be updated
+    incrementally and re-aggregated to any coarser level exactly.
+    """
+    if user_data.empty:
+        return empty_rollup()
+
+    sessions = pd.DataFrame({
+        'date': pd.to_datetime(user_data['date']).dt.normalize(),
+        'subject': user_data['subject'].astype(str),
+        'duration_minutes': user_data['duration_minutes'],
+        'confidence_rating': user_data['confidence_rating'],
+    })
+    cube = sessions.groupby(['date', 'subject'], sort=True).agg(
+        duration_minutes=('duration_minutes', 'sum'),
+        sessions=('duration_minutes', 'size'),
+        confidence_sum=('confidence_rating', 'sum'),
+    )
+    return cube.reset_index()
+
+
+def add_session(cube, date, subject, duration, confidence):
+    """Return the cube with one more session folded in"""
+    subject = str(subject)
+    date = pd.Timestamp(date).normalize()
+    mask = (cube['date'] == date) & (cube['subject'] == subject)
+    if mask.any():
+        cube = cube.copy()
+        cube.loc[mask, 'duration_minutes'] += duration
+        cube.loc[mask, 'sessions'] += 1
+        cube.loc[mask, 'confidence_sum'] += confidence
+        return cube
+
+    row = pd.DataFrame([{'date': date, 'subject': subject, 'duration_minutes': duration,
+                         'sessions': 1, 'confidence_sum': confidence}])
+    cube = pd.concat([cube, row], ignore_index=True) if not cube.empty else row
+    return cube.sort_values(['date', 'subject'], ignore_index=True)
+
+
+def read_rollup(path):
+    cube = pd.read_csv(path, dtype={'subject': str})
+    if cube.empty:
+        return empty_rollup()
+    cube['date'] = pd.to_datetime(cube['date'])
+    return cube[ROLLUP_COLUMNS]
+
+
+def write_rollup(cube, path):
+    tmp_path = f"{path}.tmp"
+    cube.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def _totals(cube, by):
+    totals = cube.groupby(by, sort=True)[['duration_minutes', 'sessions', 'confidence_sum']].sum()
+    totals['avg_confidence'] = totals['confidence_sum'] / totals['sessions']
+    return totals.drop(columns='confidence_sum').reset_index()
+
+
+def daily_totals(cube):
+    """Minutes, sessions and average confidence per date"""
+    return _totals(cube, 'date')
+
+
+def subject_totals(cube):
+    """Minutes, sessions and average confidence per subject"""
+    return _totals(cube, 'subject')
+
+
+def summarize(cube):
+    """Headline metrics of a (possibly period-filtered) cube"""
+    if cube.empty:
+        return {}
+    sessions = int(cube['sessions'].sum())
+    total_time = cube['duration_minutes'].sum()
+    return {
+        'total_time': total_time,
+        'total_sessions': sessions,
+        'avg_session': total_time / sessions,
+        'avg_confidence': cube['confidence_sum'].sum() / sessions,
+        'subjects_studied': cube['subject'].nunique(),
+        'study_days': cube['date'].nunique(),
+    }
+
+
+def month_slice(cube, month, year):
+    first = date(year, month, 1)
+    last = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+    return slice_period(cube, first, last)
@@ -0,0 +1,192 @@
+import io
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from profiling import stage
+
+SCAN_CHUNK_BYTES = 8 * 1024 * 1024
+DEFAULT_PAGE_SIZE = 50
+
+
+def record_offsets(path, chunk_bytes=SCAN_CHUNK_BYTES):
+    """Byte offsets of every CSV record start in path (header included).
+
+    A newline ends a record only outside quotes, i.e. after an even number
+    of '"' bytes, so notes with embedded newlines stay one record. Blank
+    lines are skipped like pandas does. Returns (offsets, file_size).
+    """
+    starts = [np.zeros(1, dtype=np.int64)]
+    quotes = 0
+    position = 0
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_bytes)
+            if not chunk:
+                break
+            buf = np.frombuffer(chunk, dtype=np.uint8)
+            # only the parity matters, so a wrapping uint8 running count is enough
+            in_quotes = (np.cumsum(buf == ord('"'), dtype=np.uint8) + quotes) & 1
+            newlines = np.flatnonzero((buf == ord('\n')) & (in_quotes == 0))
+            starts.append(newlines.astype(np.int64) + position + 1)
+            quotes = int(in_quotes[-1])
+            position += len(chunk)
+
+    offsets = np.concatenate(starts)
+    offsets = offsets[offsets < position]
+    if len(offsets) == 0:
+        return offsets, position
+
+    # drop blank records: those whose first byte is the line end itself
+    first = np.memmap(path, dtype=np.uint8, mode='r')[offsets]
+    return offsets[(first != ord('\n')) & (first != ord('\r'))], position
+
+
+class SessionIndex:
+    """Row index over one user's study CSV for filtered, paginated browsing.
+
+    Holds, per session, the byte offset of its CSV record and compact
+    filter columns (datetime64 day, subject/chapter category codes, int8
+    confidence) plus a newest-first ordering. Queries run on those arrays;
+    page() seeks to the selected records and parses only them, so browsing
+    a large history never materializes more than one page of sessions.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        stat = os.stat(path)
+        self.version = (stat.st_mtime_ns, stat.st_size)
+
+        with stage("history.index") as record:
+            offsets, size = record_offsets(path)
+            columns = pd.read_csv(path, usecols=['date', 'subject', 'chapter', 'confidence_rating'],
+                                  dtype={'subject': str, 'chapter': str})
+            if len(offsets) != len(columns) + 1:
+                raise ValueError(f"{path}: found {len(offsets) - 1} records but pandas parsed {len(columns)} rows")
+            record['rows'] = len(columns)
+
+        self.header_end = int(offsets[1]) if len(offsets) > 1 else size
+        # session i spans bounds[i]..bounds[i + 1]; the last one ends at EOF
+        self.bounds = np.append(offsets[1:], size)
+
+        self.days = pd.to_datetime(columns['date']).to_numpy().astype('datetime64[D]')
+        subjects = pd.Categorical(columns['subject'].fillna(""))
+        chapters = pd.Categorical(columns['chapter'].fillna(""))
+        self.subjects = list(subjects.categories)
+        self.chapters = list(chapters.categories)
+        self.subject_codes = subjects.codes.astype(np.int32)
+        self.chapter_codes = chapters.codes.astype(np.int32)
+        self.confidence = columns['confidence_rating'].fillna(0).to_numpy().astype(np.int8)
+
+        # newest first; sessions logged later on the same day come first
+        self.order = np.lexsort((np.arange(len(columns)), self.days))[::-1]
+
+    def __len__(self):
+        return len(self.days)
+
+    def date_range(self):
+        if len(self) == 0:
+            return None, None
+        return self.days.min().item(), self.days.max().item()
+
+    def chapters_for(self, subjects=None):
+        """Chapter names present in the given subjects (all when None/empty)"""
+        if not subjects:
+            return self.chapters
+        codes = np.flatnonzero(np.isin(self.subjects, list(subjects)))
+        present = np.unique(self.chapter_codes[np.isin(self.subject_codes, codes)])
+        return [self.chapters[code] for code in present]
+
+    def query(self, start=None, end=None, subjects=None, chapters=None, min_confidence=None, max_confidence=None):
+        """Row numbers of matching sessions, newest first"""
+        mask = np.ones(len(self), dtype=bool)
+        if start is not None:
+            mask &= self.days >= np.datetime64(start, 'D')
+        if end is not None:
+            mask &= self.days <= np.datetime64(end, 'D')
+        if subjects:
+            mask &= np.isin(self.subject_codes, np.flatnonzero(np.isin(self.subjects, list(subjects))))
+        if chapters:
+            mask &= np.isin(self.chapter_codes, np.flatnonzero(np.isin(self.chapters, list(chapters))))
+        if min_confidence is not None:
+            mask &= self.confidence >= min_confidence
+        if max_confidence is not None:
+            mask &= self.confidence <= max_confidence
+        return self.order[mask[self.order]]
+
+    def page(self, rows, page_number=1, page_size=DEFAULT_PAGE_SIZE):
+        """Parse one page (1-based) of the given row numbers from the CSV"""
+        selected = rows[(page_number - 1) * page_size:page_number * page_size]
+        with open(self.path, 'rb') as f:
+            header = f.read(self.header_end)
+            records = []
+            for row in selected:
+                f.seek(self.bounds[row])
+                record = f.read(int(self.bounds[row + 1] - self.bounds[row]))
+                records.append(record if record.endswith(b"\n") else record + b"\n")
+
+        page = pd.read_csv(io.BytesIO(header + b"".join(records)), dtype={'subject': str, 'chapter': str})
+        if not page.empty and 'date' in page.columns:
+            page['date'] = pd.to_datetime(page['date']).dt.date
+        page.index = selected
+        return page
+
+
+class SessionIndexCache:
+    """Process-wide LRU of SessionIndex objects, rebuilt when a CSV changes"""
+
+    def __init__(self, max_entries=16):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, path):
+        """Return the index for path, or None when the file does not exist"""
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        with self._lock:
+            index = self._entries.get(path)
+            if index is not None and index.version == (stat.st_mtime_ns, stat.st_size):
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return index
+
+        index = SessionIndex(path)
+        with self._lock:
+            self.builds += 1
+            self._entries[path] = index
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return index
+
+    def metrics(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'rows': sum(len(index) for index in self._entries.values()),
+                'hits': self.hits,
+                'builds': self.builds,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_session_index_cache():
+    """Return the process-wide SessionIndexCache shared by all sessions"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SessionIndexCache()
+    return _cache
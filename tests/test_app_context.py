@@ -0,0 +1,135 @@
+import os
+import sys
+from datetime import date, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from app_context import DataContext
+from data_manager import DataManager
+from gamification import GamificationSystem
+
+
+class FakeStore:
+    """In-memory stand-in for the DataManager that counts CSV loads"""
+
+    def __init__(self, sessions):
+        self.sessions = sessions
+        self.loads = 0
+
+    def get_user_data(self, username):
+        self.loads += 1
+        return pd.DataFrame(self.sessions)
+
+    def log_study_session(self, username, subject, chapter, duration, confidence, date, notes=""):
+        self.sessions.append({'date': date, 'subject': subject, 'chapter': chapter,
+                              'duration_minutes': duration, 'confidence_rating': confidence, 'notes': notes})
+        return True
+
+
+def _session(days_ago, duration=60, confidence=4):
+    return {'date': date.today() - timedelta(days=days_ago), 'subject': "Math", 'chapter': "Algebra",
+            'duration_minutes': duration, 'confidence_rating': confidence, 'notes': ""}
+
+
+def _read_like_a_rerun(ctx):
+    # sidebar stats, shown only for users with sessions
+    sidebar = None
+    if not ctx.user_data.empty:
+        sidebar = (ctx.level, ctx.total_xp, ctx.streak)
+    # page body
+    page = (len(ctx.user_data), ctx.streak, ctx.total_xp, ctx.level)
+    return sidebar, page
+
+
+def test_sidebar_and_page_share_one_load():
+    store = FakeStore([_session(2), _session(1)])
+    ctx = DataContext(store, GamificationSystem(), "alice")
+
+    sidebar, page = _read_like_a_rerun(ctx)
+
+    assert store.loads == 1
+    assert ctx.loads == 1
+    assert sidebar == (page[3], page[2], page[1])
+    assert page[0] == 2
+    assert page[1] == 2
+
+
+def test_log_study_session_invalidates_context():
+    store = FakeStore([_session(2), _session(1)])
+    ctx = DataContext(store, GamificationSystem(), "alice")
+    _, before = _read_like_a_rerun(ctx)
+
+    assert ctx.log_study_session("Math", "Geometry", 45, 5, date.today())
+    _, after = _read_like_a_rerun(ctx)
+
+    assert store.loads == 2
+    assert ctx.loads == 2
+    assert after[0] == before[0] + 1
+    assert after[1] == before[1] + 1
+    assert after[2] > before[2]
+
+
+class CountingDataManager(DataManager):
+    """The app's real DataManager, counting get_user_data calls"""
+
+    def __init__(self, data_dir):
+        super().__init__(data_dir)
+        self.loads = 0
+
+    def get_user_data(self, username):
+        self.loads += 1
+        return super().get_user_data(username)
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    # keep any relative paths the app writes (caches, rollups) inside tmp_path
+    monkeypatch.chdir(tmp_path)
+    store = CountingDataManager(str(tmp_path / "data"))
+    store.create_user("alice", "secret1")
+    pd.DataFrame([dict(_session(days_ago), timestamp=f"{date.today() - timedelta(days=days_ago)}T18:00:00")
+                  for days_ago in range(20, 0, -1)]).to_csv(store.get_user_file_path("alice"), index=False)
+
+    at = AppTest.from_file(os.path.join(ROOT, "elevate.py"), default_timeout=60)
+    at.session_state['data_manager'] = store
+    at.session_state['current_user'] = "alice"
+    return at, store
+
+
+def _loads_during(store, action):
+    before = store.loads
+    at = action()
+    assert not at.exception, [e.value for e in at.exception]
+    return store.loads - before
+
+
+def _navigate(at, page):
+    return next(box for box in at.selectbox if box.label == "Navigate to:").select(page).run()
+
+
+def test_each_page_rerun_loads_once(app):
+    at, store = app
+
+    assert _loads_during(store, at.run) == 1  # sidebar + Dashboard
+    for page in ["Progress Reports", "Log Study Session", "Dashboard"]:
+        assert _loads_during(store, lambda: _navigate(at, page)) == 1, page
+
+
+def test_logging_a_session_reloads_once(app):
+    at, store = app
+    at.run()
+    _navigate(at, "Log Study Session")
+
+    next(field for field in at.text_input if field.label == "Subject:").input("Physics")
+    next(field for field in at.text_input if field.label == "Chapter/Topic:").input("Optics")
+    submit = next(button for button in at.button if button.label == "Log Session")
+
+    # the sidebar's load before the write, and one fresh load for the figures after it
+    assert _loads_during(store, submit.click().run) == 2
+    assert len(at.session_state['data_context'].user_data) == 21
+    assert _loads_during(store, at.run) == 1
@@ -0,0 +1,41 @@
+import os
+import sys
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+import pandas.testing as pdt
+
+from data_store import apply_study_schema
+from forecasting import forecast_topic_trends
+
+
+def _sessions():
+    start = date(2024, 3, 1)
+    return pd.DataFrame({
+        'date': [start + timedelta(days=d) for d in (0, 2, 5, 1, 4, 6, 3)],
+        'subject': ["Math", "Math", "Math", "Physics", "Physics", "Physics", "Math"],
+        'chapter': ["Algebra", "Algebra", "Algebra", "Optics", "Optics", "Optics", np.nan],
+        'duration_minutes': [30, 45, 60, 30, 30, 30, 40],
+        'confidence_rating': [2, 3, 4, 5, 4, 3, 1],
+    })
+
+
+def test_missing_chapter_is_ignored():
+    sessions = _sessions()
+    expected = forecast_topic_trends(sessions.dropna(subset=['chapter']))
+
+    for frame in (sessions, apply_study_schema(sessions.copy())):
+        forecasts = forecast_topic_trends(frame)
+        pdt.assert_frame_equal(forecasts.astype({'subject': str, 'chapter': str}),
+                               expected.astype({'subject': str, 'chapter': str}))
+        assert forecasts[['subject', 'chapter']].notna().all().all()
+        assert forecasts['sessions'].tolist() == [3, 3]
+
+
+def test_only_missing_keys_gives_empty_forecast():
+    sessions = _sessions().assign(chapter=np.nan)
+
+    assert forecast_topic_trends(sessions).empty
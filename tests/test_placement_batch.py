@@ -0,0 +1,78 @@
+import io
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pandas as pd
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from data_manager import DataManager
+from placement_batch import score_frame
+
+# One candidate near the decision boundary, entered as in the single-candidate form;
+# ExtracurricularActivities 6 is predicted Placed and 5 Not Placed
+FORM_INPUTS = {
+    "CGPA": 7.0,
+    "Internships (count)": 1,
+    "Projects (count)": 1,
+    "Workshops/Certifications (count)": 1,
+    "Aptitude Test Score": 60,
+    "SSC Marks:10th grade (%)": 60.0,
+    "HSC Marks:12th grade (%)": 60.0,
+}
+SOFT_SKILLS = 5
+TRAINING = "No"
+
+
+def _batch_row(extracurricular):
+    return {
+        "CGPA": 7.0, "Internships": 1, "Projects": 1, "Workshops/Certifications": 1,
+        "AptitudeTestScore": 60, "SoftSkillsRating": SOFT_SKILLS, "ExtracurricularActivities": extracurricular,
+        "PlacementTraining": TRAINING, "SSC_Marks": 60.0, "HSC_Marks": 60.0,
+    }
+
+
+def _form_prediction(tmp_path, extracurricular):
+    store = DataManager(str(tmp_path / "data"))
+    store.create_user("alice", "secret1")
+    at = AppTest.from_file(os.path.join(ROOT, "elevate.py"), default_timeout=60)
+    at.session_state['data_manager'] = store
+    at.session_state['current_user'] = "alice"
+    at.run()
+    next(box for box in at.selectbox if box.label == "Navigate to:").select("Placement Prediction").run()
+
+    for label, value in FORM_INPUTS.items():
+        next(field for field in at.number_input if field.label == label).set_value(value)
+    next(slider for slider in at.slider if slider.label.startswith("Soft Skills")).set_value(SOFT_SKILLS)
+    next(slider for slider in at.slider if slider.label.startswith("Extracurricular")).set_value(extracurricular)
+    next(box for box in at.selectbox if box.label == "Placement Training").select(TRAINING)
+    next(button for button in at.button if button.label == "Predict Placement").click().run()
+
+    assert not at.exception, [e.value for e in at.exception]
+    if any(message.value == "Candidate is likely to be Placed." for message in at.success):
+        return "Placed"
+    assert any(message.value == "Candidate is unlikely to be Placed." for message in at.warning)
+    return "Not Placed"
+
+
+@pytest.mark.parametrize("extracurricular, expected", [(6, "Placed"), (5, "Not Placed")])
+def test_form_and_batch_agree(tmp_path, monkeypatch, extracurricular, expected):
+    # the page loads kagglelogo.png relative to the working directory
+    monkeypatch.chdir(ROOT)
+    batch = score_frame(pd.read_csv(io.StringIO(pd.DataFrame([_batch_row(extracurricular)]).to_csv(index=False))))
+
+    assert batch["status"].tolist() == ["ok"]
+    assert batch["prediction"].tolist() == [expected]
+    assert _form_prediction(tmp_path, extracurricular) == expected
+
+
+def test_extracurricular_is_a_rating_not_a_flag():
+    frame = pd.DataFrame([_batch_row("Yes"), _batch_row(0), _batch_row("6")])
+    scored = score_frame(frame)
+
+    assert scored["status"].tolist()[:2] == ["ExtracurricularActivities must be a number between 1 and 10"] * 2
+    assert scored["status"].tolist()[2] == "ok"
+    assert scored["prediction"].tolist()[2] == "Placed"
@@ -0,0 +1,69 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+import pytest
+
+from placement_model import MANIFEST_FILE, MODEL_FILE, SCALER_FILE, ModelIntegrityError, PlacementModelRegistry
+from placement_numpy import NUMPY_MODEL_DIR
+
+
+@pytest.fixture
+def base_dir(tmp_path):
+    for name in (MODEL_FILE, SCALER_FILE, MANIFEST_FILE):
+        shutil.copy(os.path.join(ROOT, name), tmp_path / name)
+    shutil.copytree(os.path.join(ROOT, NUMPY_MODEL_DIR), tmp_path / NUMPY_MODEL_DIR)
+    return tmp_path
+
+
+def _retrain_scaler(base_dir):
+    """Replace scaler.pkl with a different scaler and record it in the manifest, without re-exporting"""
+    with open(base_dir / SCALER_FILE, 'rb') as f:
+        scaler = pickle.load(f)
+    scaler.mean_ = scaler.mean_ * 1.5
+    data = pickle.dumps(scaler)
+    (base_dir / SCALER_FILE).write_bytes(data)
+
+    manifest = json.loads((base_dir / MANIFEST_FILE).read_text())
+    manifest['artifacts'][SCALER_FILE]['sha256'] = hashlib.sha256(data).hexdigest()
+    (base_dir / MANIFEST_FILE).write_text(json.dumps(manifest))
+
+
+def _candidate():
+    # one row in FEATURE_COLUMNS order
+    return np.array([[7.5, 1, 2, 1, 75, 4.5, 1, 1, 75, 80]], dtype=float)
+
+
+def test_auto_serves_arrays_exported_from_current_pickles(base_dir):
+    registry = PlacementModelRegistry(base_dir=str(base_dir))
+    registry.predict(_candidate())
+
+    assert registry.active_engine == "numpy"
+    assert registry.load_warnings == []
+
+
+def test_auto_falls_back_to_pickles_when_arrays_are_stale(base_dir):
+    _retrain_scaler(base_dir)
+    registry = PlacementModelRegistry(base_dir=str(base_dir))
+
+    with pytest.warns(RuntimeWarning, match="scaler.pkl changed"):
+        _, probabilities = registry.predict(_candidate())
+
+    assert registry.active_engine == "sklearn"
+    assert "scaler.pkl changed" in registry.load_warnings[0]
+    expected = PlacementModelRegistry(base_dir=str(base_dir), engine="sklearn").predict(_candidate())[1]
+    assert probabilities[0] == expected[0]
+
+
+def test_numpy_engine_refuses_stale_arrays(base_dir):
+    _retrain_scaler(base_dir)
+
+    with pytest.raises(ModelIntegrityError, match="scaler.pkl changed"):
+        PlacementModelRegistry(base_dir=str(base_dir), engine="numpy").get()
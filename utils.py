@@ -1,6 +1,9 @@
 import pandas as pd
 from datetime import datetime, timedelta
 import numpy as np
+import hashlib
+
+from profiling import profiled
 
 def format_time(minutes):
     """Convert minutes to a human-readable format"""
@@ -21,6 +24,7 @@ def format_time(minutes):
         else:
             return f"{hours} hours {remaining_minutes} min"
 
+@profiled("utils.streak")
 def calculate_streak(user_data):
     """Calculate the current study streak in days"""
     if user_data.empty:
@@ -56,26 +60,64 @@ def calculate_streak(user_data):
     
     return streak
 
+def _sorted_by_date(data):
+    """data with a datetime64 'date' column in ascending order (unchanged when it already is)"""
+    if not pd.api.types.is_datetime64_any_dtype(data['date']):
+        data = data.assign(date=pd.to_datetime(data['date']))
+    if not data['date'].is_monotonic_increasing:
+        data = data.sort_values('date', kind='stable')
+    return data
+
+def slice_period(data, start=None, end=None):
+    """Rows of data dated from start to end (inclusive days; None = open).
+
+    data is expected sorted by a datetime64 'date' column, as returned by
+    StudyDataStore.get_user_data and the rollup cube, so the bounds are two
+    searchsorted lookups and the result is a positional slice rather than
+    a boolean-mask copy. Other frames are converted and sorted first.
+    """
+    if data.empty:
+        return data
+    
+    data = _sorted_by_date(data)
+    dates = data['date'].to_numpy()
+    lo = 0 if start is None else dates.searchsorted(np.datetime64(start, 'D'), side='left')
+    hi = len(dates) if end is None else dates.searchsorted(np.datetime64(end, 'D') + 1, side='left')
+    return data.iloc[lo:hi]
+
+@profiled("utils.date_range")
 def get_date_range_data(user_data, days_back):
     """Get user data for the last N days"""
     if user_data.empty:
         return pd.DataFrame()
     
     end_date = datetime.now().date()
-    start_date = end_date - timedelta(days=days_back)
-    
-    # Convert date column to datetime if it's not already
-    user_data_copy = user_data.copy()
-    user_data_copy['date'] = pd.to_datetime(user_data_copy['date']).dt.date
-    
-    # Filter data
-    filtered_data = user_data_copy[
-        (user_data_copy['date'] >= start_date) & 
-        (user_data_copy['date'] <= end_date)
-    ]
-    
-    return filtered_data
+    return slice_period(user_data, end_date - timedelta(days=days_back), end_date)
 
+# Report periods offered in the UI and the bulk report command (None = all time)
+REPORT_PERIODS = {"Last 7 days": 7, "Last 30 days": 30, "Last 90 days": 90, "All time": None}
+
+def filter_by_period(user_data, period):
+    """Get user data for one of the REPORT_PERIODS, up to today"""
+    end_date = datetime.now().date()
+    days_back = REPORT_PERIODS[period]
+    start_date = None if days_back is None else end_date - timedelta(days=days_back)
+    return slice_period(user_data, start_date, end_date)
+
+def recent_sessions(user_data, n):
+    """The n sessions logged last, oldest first.
+
+    Loaded data is sorted by study date, so tail(n) would show the latest
+    study dates and miss a backfilled session logged today; order by the
+    logging timestamp instead (rows without one count as oldest).
+    """
+    if 'timestamp' not in user_data.columns:
+        return user_data.tail(n)
+    logged = pd.to_datetime(user_data['timestamp'], format='ISO8601', errors='coerce').reset_index(drop=True)
+    order = logged.sort_values(kind='stable', na_position='first').index[-n:]
+    return user_data.iloc[order]
+
+@profiled("utils.consistency")
 def calculate_consistency_score(user_data, days_back=30):
     """Calculate consistency score for the last N days (0-100)"""
     if user_data.empty:
@@ -89,7 +131,7 @@ def calculate_consistency_score(user_data, days_back=30):
     unique_study_days = recent_data['date'].nunique()
     
     # Calculate possible study days (excluding today if no study yet)
-    possible_days = min(days_back, (datetime.now().date() - recent_data['date'].min()).days + 1)
+    possible_days = min(days_back, (datetime.now().date() - recent_data['date'].min().date()).days + 1)
     
     if possible_days == 0:
         return 0
@@ -98,6 +140,7 @@ def calculate_consistency_score(user_data, days_back=30):
     consistency = (unique_study_days / possible_days) * 100
     return min(100, consistency)
 
+@profiled("utils.habits")
 def get_study_habits_analysis(user_data):
     """Analyze study habits and return insights"""
     if user_data.empty:
@@ -116,7 +159,7 @@ def get_study_habits_analysis(user_data):
     
     # Subject diversity
     analysis['subjects_studied'] = user_data['subject'].nunique()
-    analysis['most_studied_subject'] = user_data.groupby('subject')['duration_minutes'].sum().idxmax()
+    analysis['most_studied_subject'] = user_data.groupby('subject', observed=True)['duration_minutes'].sum().idxmax()
     
     # Consistency
     analysis['current_streak'] = calculate_streak(user_data)
@@ -129,6 +172,7 @@ def get_study_habits_analysis(user_data):
     
     return analysis
 
+@profiled("utils.confidence_trend")
 def calculate_confidence_trend(user_data, window_size=5):
     """Calculate trend in confidence ratings (positive = improving, negative = declining)"""
     if len(user_data) < window_size * 2:
@@ -143,13 +187,14 @@ def calculate_confidence_trend(user_data, window_size=5):
     
     return last_portion - first_portion
 
+@profiled("utils.weak_topics")
 def get_weak_topics(user_data, confidence_threshold=3.0, min_sessions=2):
     """Identify topics that need more attention"""
     if user_data.empty:
         return []
     
     # Group by subject and chapter
-    topic_stats = user_data.groupby(['subject', 'chapter']).agg({
+    topic_stats = user_data.groupby(['subject', 'chapter'], observed=True).agg({
         'confidence_rating': ['mean', 'count'],
         'duration_minutes': 'sum'
     }).round(2)
@@ -166,56 +211,12 @@ def get_weak_topics(user_data, confidence_threshold=3.0, min_sessions=2):
     
     return weak_topics.to_dict('records')
 
+@profiled("utils.recommendations")
 def get_study_recommendations(user_data):
     """Generate study recommendations based on user data"""
-    recommendations = []
-    
-    if user_data.empty:
-        return ["Start logging your study sessions to get personalized recommendations!"]
+    from recommendations import engine
     
-    habits = get_study_habits_analysis(user_data)
-    
-    # Session length recommendations
-    if habits['avg_session_length'] < 15:
-        recommendations.append("Try longer study sessions (20-45 minutes) for better focus and retention.")
-    elif habits['avg_session_length'] > 90:
-        recommendations.append("Consider breaking long sessions into smaller chunks with breaks.")
-    
-    # Consistency recommendations
-    if habits['current_streak'] == 0:
-        recommendations.append("Start building a study streak! Consistent daily practice is key to success.")
-    elif habits['consistency_30d'] < 50:
-        recommendations.append("Try to study more regularly. Aim for at least 4-5 sessions per week.")
-    
-    # Confidence recommendations
-    if habits['avg_confidence'] < 3.0:
-        recommendations.append("Focus on building confidence. Review fundamentals and practice more problems.")
-    elif habits['confidence_improvement'] < -0.3:
-        recommendations.append("Your confidence seems to be declining. Consider reviewing recent topics or seeking help.")
-    
-    # Subject diversity
-    if habits['subjects_studied'] == 1:
-        recommendations.append("Consider studying multiple subjects to maintain engagement and prevent burnout.")
-    elif habits['subjects_studied'] > 5:
-        recommendations.append("You're studying many subjects. Ensure you're giving adequate time to each.")
-    
-    # Recent activity
-    if habits['recent_sessions'] == 0:
-        recommendations.append("You haven't studied recently. Get back on track with a short session today!")
-    elif habits['recent_study_time'] < 60:  # Less than 1 hour in last week
-        recommendations.append("Increase your weekly study time for better progress.")
-    
-    # Weak topics
-    weak_topics = get_weak_topics(user_data)
-    if weak_topics:
-        top_weak = weak_topics[:2]
-        subjects = [f"{topic['subject']} - {topic['chapter']}" for topic in top_weak]
-        recommendations.append(f"Give extra attention to: {', '.join(subjects)}")
-    
-    if not recommendations:
-        recommendations.append("Excellent study habits! Keep up the great work!")
-    
-    return recommendations[:5]  # Limit to 5 recommendations
+    return engine.recommend(user_data, "ui")
 
 def format_confidence_rating(rating):
     """Format confidence rating with stars"""
@@ -241,6 +242,7 @@ def get_performance_grade(avg_confidence):
     else:
         return "F"
 
+@profiled("utils.period_xp")
 def calculate_xp_for_period(user_data, days_back=30):
     """Calculate total XP earned in the last N days"""
     from gamification import GamificationSystem
@@ -283,10 +285,19 @@ def validate_study_session(subject, chapter, duration, confidence):
     
     return errors
 
-def get_monthly_summary(user_data, target_month=None, target_year=None):
-    """Get summary statistics for a specific month"""
-    if user_data.empty:
-        return {}
+@profiled("utils.monthly_summary")
+def get_monthly_summary(user_data, target_month=None, target_year=None, rollup=None):
+    """Get summary statistics for a specific month
+
+    Reads the day x subject rollup cube (pass the stored one to skip
+    aggregating user_data).
+    """
+    from rollup import build_rollup, month_slice, subject_totals, summarize
+
+    if rollup is None:
+        if user_data.empty:
+            return {}
+        rollup = build_rollup(user_data)
     
     # Default to current month if not specified
     if target_month is None:
@@ -294,27 +305,15 @@ def get_monthly_summary(user_data, target_month=None, target_year=None):
     if target_year is None:
         target_year = datetime.now().year
     
-    # Filter data for the target month
-    user_data_copy = user_data.copy()
-    user_data_copy['date'] = pd.to_datetime(user_data_copy['date'])
-    
-    monthly_data = user_data_copy[
-        (user_data_copy['date'].dt.month == target_month) &
-        (user_data_copy['date'].dt.year == target_year)
-    ]
-    
-    if monthly_data.empty:
+    monthly = month_slice(rollup, target_month, target_year)
+    if monthly.empty:
         return {}
     
-    summary = {
-        'total_time': monthly_data['duration_minutes'].sum(),
-        'total_sessions': len(monthly_data),
-        'avg_confidence': monthly_data['confidence_rating'].mean(),
-        'subjects_studied': monthly_data['subject'].nunique(),
-        'study_days': monthly_data['date'].dt.date.nunique(),
-        'best_subject': monthly_data.groupby('subject')['confidence_rating'].mean().idxmax(),
-        'most_studied_subject': monthly_data.groupby('subject')['duration_minutes'].sum().idxmax()
-    }
+    subjects = subject_totals(monthly).set_index('subject')
+    summary = summarize(monthly)
+    del summary['avg_session']
+    summary['best_subject'] = subjects['avg_confidence'].idxmax()
+    summary['most_studied_subject'] = subjects['duration_minutes'].idxmax()
     
     return summary
 
@@ -330,12 +329,13 @@ def export_data_to_csv(user_data, filename=None):
     
     return export_data.to_csv(index=False)
 
+@profiled("utils.subject_comparison")
 def get_subject_performance_comparison(user_data):
     """Compare performance across different subjects"""
     if user_data.empty:
         return {}
     
-    subject_stats = user_data.groupby('subject').agg({
+    subject_stats = user_data.groupby('subject', observed=True).agg({
         'confidence_rating': ['mean', 'std', 'count'],
         'duration_minutes': ['sum', 'mean']
     }).round(2)
@@ -350,4 +350,14 @@ def get_subject_performance_comparison(user_data):
     # Sort by average confidence (descending)
     subject_stats = subject_stats.sort_values('avg_confidence', ascending=False)
     
-    return subject_stats.to_dict('records')
\ No newline at end of file
+    return subject_stats.to_dict('records')
+
+def data_fingerprint(user_data):
+    """Return a short content hash identifying this version of the data"""
+    if user_data.empty:
+        return "empty"
+    
+    row_hashes = pd.util.hash_pandas_object(user_data, index=False).to_numpy()
+    digest = hashlib.sha1(row_hashes.tobytes())
+    digest.update(",".join(map(str, user_data.columns)).encode())
+    return digest.hexdigest()[:16]